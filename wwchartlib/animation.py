@@ -0,0 +1,100 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Animation of charts, driven by a single shared timer.
+"""
+
+from PySide.QtCore import *
+
+
+class Animator(QObject):
+    """Drives the animations of all charts from a single timer.
+
+    An animation is a callable that is called once per frame with the
+    current time (see ``elapsed``), updates its chart to match, and
+    returns whether it is still running.  The timer only runs while
+    there are animations.
+
+    Animations are expected to be time-based, so frames may be dropped:
+    if computing and painting a frame takes longer than ``budget``
+    milliseconds, frames are dropped for the time by which it went over,
+    so that slow charts lower the frame rate rather than saturate the
+    event loop.
+    """
+    interval = 16  # milliseconds between frames
+    budget = 16  # milliseconds a frame may take, including painting
+
+    def __init__(self, parent=None):
+        super(Animator, self).__init__(parent)
+        self._animations = []
+        self._clock = QElapsedTimer()
+        self._clock.start()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.interval)
+        self._timer.timeout.connect(self._frame)
+        self._cost = 0  # milliseconds taken by the last frame so far
+        self._resume = 0  # time at which frames are no longer dropped
+
+    def elapsed(self):
+        """Return the current time, in milliseconds."""
+        return self._clock.elapsed()
+
+    def addAnimation(self, animation):
+        """Start calling ``animation`` every frame, if not already."""
+        if animation not in self._animations:
+            self._animations.append(animation)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def removeAnimation(self, animation):
+        """Stop calling ``animation``."""
+        if animation in self._animations:
+            self._animations.remove(animation)
+        if not self._animations:
+            self._timer.stop()
+
+    def addPaintTime(self, msecs):
+        """Add the time taken to paint a chart to the cost of the frame."""
+        self._cost += msecs
+
+    def _frame(self):
+        now = self.elapsed()
+        over = self._cost - self.budget
+        self._cost = 0
+        if over > 0:
+            self._resume = now + over
+        if now < self._resume:
+            return  # dropped, to catch up
+        for animation in list(self._animations):
+            try:
+                running = animation(now)
+            except RuntimeError:
+                running = False  # the chart has been deleted
+            if not running:
+                self.removeAnimation(animation)
+        self._cost = self.elapsed() - now
+
+
+_animator = None
+
+
+def animator():
+    """Return the shared ``Animator``."""
+    global _animator
+    if _animator is None:
+        _animator = Animator()
+    return _animator
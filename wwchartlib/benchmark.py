@@ -0,0 +1,273 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmarks of the chart widgets.
+
+Run as ``python -m wwchartlib.benchmark``; see ``main``.  Results are
+written as JSON, and can be compared against the results of an earlier
+run to find regressions.
+
+The widgets are never shown: painting is measured by rendering the
+widget into a ``QImage``.  A ``QApplication`` is still needed for the
+widgets, so a display is required (e.g. ``Xvfb`` on a headless machine).
+"""
+
+from __future__ import division
+
+import argparse
+import json
+import platform
+import re
+import sys
+import timeit
+
+import PySide
+from PySide.QtCore import *
+from PySide.QtGui import *
+
+from . import piechart
+
+
+"""Numbers of items the benchmarks are run with."""
+SIZES = (10, 100, 1000, 10000, 100000)
+
+"""Sizes of the images the charts are painted to, in pixels."""
+PAINT_SIZES = (100, 400, 1600)
+
+
+def _items(n):
+    """Return ``n`` ``PieChartItem``s of equal fraction."""
+    # 1 / (n + 1), so rounding cannot take the sum over 1
+    return [piechart.PieChartItem(fraction=1 / (n + 1)) for i in xrange(n)]
+
+
+def _mouse_event(type, x, y):
+    return QMouseEvent(
+        type, QPoint(int(x), int(y)), Qt.LeftButton, Qt.LeftButton,
+        Qt.NoModifier
+    )
+
+
+def set_items(n):
+    """Setting the items of a chart with ``n`` items."""
+    chart = piechart.PieChart()
+    items = _items(n)
+    return lambda: chart.setChartItems(items)
+
+
+def add_item(n):
+    """Adding (and removing) an item to a chart with ``n`` items."""
+    chart = piechart.PieChart(items=_items(n))
+    item = piechart.PieChartItem(fraction=0)
+
+    def run():
+        chart.addChartItem(item)
+        chart.removeChartItem(-1)
+    return run
+
+
+def paint(n, size):
+    """Painting a chart with ``n`` items to a ``size`` square image."""
+    chart = piechart.PieChart(items=_items(n))
+    chart.resize(size, size)
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+
+    def run():
+        image.fill(0)
+        chart.render(image)
+    return run
+
+
+def drag(n, moves=100):
+    """Dragging a grip of a chart with ``n`` items through ``moves``."""
+    return _drag(piechart.AdjustablePieChart(items=_items(n)), moves)
+
+
+def _drag(chart, moves):
+    """Return a function dragging the first grip of the chart.
+
+    The grip is dragged through ``moves`` mouse movements and back to
+    where it started, so that every call drags it the same way.
+    """
+    chart.resize(400, 400)
+    x, y, angle, item = chart._grips()[0]
+    # to and fro along the arc of the first two slices
+    span = 2 * piechart.fraction_to_angle(
+        chart.chartItems()[0].fraction)
+    points = [
+        chart._cartesian(angle + span * (i % 10 - 5) / 10)
+        for i in xrange(moves - 1)
+    ]
+    points.append((x, y))
+
+    def run():
+        QApplication.sendEvent(
+            chart, _mouse_event(QEvent.MouseButtonPress, x, y))
+        for px, py in points:
+            QApplication.sendEvent(
+                chart, _mouse_event(QEvent.MouseMove, px, py))
+        QApplication.sendEvent(
+            chart, _mouse_event(QEvent.MouseButtonRelease, px, py))
+    return run
+
+
+def benchmarks(max_items=SIZES[-1]):
+    """Return the benchmarks, as a list of ``(name, factory)``.
+
+    Calling ``factory`` sets up the benchmark and returns the function
+    to time.
+    """
+    sizes = [n for n in SIZES if n <= max_items]
+    result = []
+    for n in sizes:
+        result.append(('set_items/{}'.format(n), lambda n=n: set_items(n)))
+    for n in sizes:
+        result.append(('add_item/{}'.format(n), lambda n=n: add_item(n)))
+    for n in sizes[::2]:
+        for size in PAINT_SIZES:
+            result.append((
+                'paint/{}/{}'.format(n, size),
+                lambda n=n, size=size: paint(n, size)
+            ))
+    for n in sizes[::2]:
+        result.append(('drag/{}'.format(n), lambda n=n: drag(n)))
+    return result
+
+
+def measure(func, repeat=5, min_time=0.01):
+    """Return the best time of ``func``, in seconds per call.
+
+    ``func`` is called enough times in a row to take at least
+    ``min_time`` seconds, and this is repeated ``repeat`` times.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        best = timer.timeit(number)
+        if best >= min_time:
+            break
+        number *= 10
+    for i in xrange(repeat - 1):
+        best = min(best, timer.timeit(number))
+    return best / number
+
+
+def run(pattern=None, repeat=5, max_items=SIZES[-1], log=None):
+    """Run the benchmarks whose names match the regular expression
+    ``pattern`` (all, if ``None``).
+
+    log
+      If given, a file to which progress is written.
+
+    Return a ``dict`` of the results, suitable for JSON.
+    """
+    app = QApplication.instance() or QApplication([])
+    results = {}
+    for name, factory in benchmarks(max_items):
+        if pattern is not None and not re.search(pattern, name):
+            continue
+        results[name] = measure(factory(), repeat)
+        if log is not None:
+            log.write('{:<24} {:12.6f} ms\n'.format(
+                name, results[name] * 1000))
+    return {
+        'python': platform.python_version(),
+        'pyside': PySide.__version__,
+        'qt': qVersion(),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=1.25):
+    """Compare results against a baseline.
+
+    Return a list of ``(name, baseline time, current time, ratio)`` for
+    the benchmarks in both, and a list of the names of the benchmarks
+    that are slower than the baseline by more than ``threshold`` times.
+    """
+    rows = []
+    regressions = []
+    for name in sorted(current['results']):
+        if name not in baseline['results']:
+            continue
+        old = baseline['results'][name]
+        new = current['results'][name]
+        ratio = new / old if old else float('inf')
+        rows.append((name, old, new, ratio))
+        if ratio > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    """Run the benchmarks.
+
+    Usage: ``python -m wwchartlib.benchmark [-o FILE] [--compare FILE]
+    [--threshold RATIO] [-k PATTERN] [--repeat N] [--max-items N]``
+
+    With ``--compare``, exit with status 1 if any benchmark is slower
+    than in the baseline by more than the threshold.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m wwchartlib.benchmark',
+        description='Benchmark the wwchartlib chart widgets.'
+    )
+    parser.add_argument(
+        '-o', '--output', type=argparse.FileType('w'),
+        help='file to write the results to, as JSON'
+    )
+    parser.add_argument(
+        '--compare', type=argparse.FileType('r'),
+        help='results of an earlier run (JSON) to compare against'
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=1.25,
+        help='slowdown ratio counted as a regression (default: 1.25)'
+    )
+    parser.add_argument(
+        '-k', dest='pattern',
+        help='only run benchmarks whose names match this regex'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help='number of timings of each benchmark (default: 5)'
+    )
+    parser.add_argument(
+        '--max-items', type=int, default=SIZES[-1],
+        help='largest number of items (default: {})'.format(SIZES[-1])
+    )
+    args = parser.parse_args(argv)
+
+    current = run(args.pattern, args.repeat, args.max_items, sys.stderr)
+    if args.output:
+        json.dump(current, args.output, indent=2, sort_keys=True)
+        args.output.write('\n')
+    if not args.compare:
+        return 0
+
+    rows, regressions = compare(
+        json.load(args.compare), current, args.threshold)
+    for name, old, new, ratio in rows:
+        sys.stdout.write('{:<24} {:12.6f} {:12.6f} {:6.2f}x{}\n'.format(
+            name, old * 1000, new * 1000, ratio,
+            '  REGRESSION' if name in regressions else ''
+        ))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
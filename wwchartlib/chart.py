@@ -18,10 +18,24 @@
 Common classes and routines for ``wwchartlib``.
 """
 
+import bisect
+import collections
+import contextlib
+import itertools
+import threading
+import timeit
+
+from PySide.QtCore import *
 from PySide.QtGui import *
 
 
+"""Item data role under which a model may provide ``ChartItem``s."""
+ItemRole = Qt.UserRole + 1
+
+
 class ChartItem(object):
+    __slots__ = ('label', 'value', 'data')
+
     def __init__(self, label=None, value=None, data=None, **kwargs):
         """Initialise the chart item.
 
@@ -41,8 +55,71 @@ class ChartItem(object):
         self.data = data
 
 
+class ChartStats(object):
+    """Counters and distributions of values recorded by a chart.
+
+    See ``Chart.setStatsEnabled``.
+    """
+
+    """Upper bounds of the buckets of the histograms.
+
+    Values greater than the last bound are counted in an extra bucket.
+    """
+    bounds = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+    def __init__(self):
+        self.counters = {}  # name -> count
+        self.distributions = {}  # name -> [count, total, max, histogram]
+
+    def count(self, name, n=1):
+        """Add ``n`` to the counter ``name``."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self, name, value):
+        """Record a value (e.g. a duration) in the distribution ``name``."""
+        try:
+            distribution = self.distributions[name]
+        except KeyError:
+            distribution = self.distributions[name] = \
+                [0, 0, 0, [0] * (len(self.bounds) + 1)]
+        distribution[0] += 1
+        distribution[1] += value
+        distribution[2] = max(distribution[2], value)
+        distribution[3][bisect.bisect_left(self.bounds, value)] += 1
+
+    def as_dict(self):
+        """Return the statistics as a dict.
+
+        Counters map to their counts.  Distributions map to a dict with
+        keys ``'count'``, ``'total'``, ``'max'`` and ``'histogram'`` (the
+        number of values in each bucket; see ``bounds``).
+        """
+        stats = dict(self.counters)
+        for name, (count, total, max_, histogram) \
+                in self.distributions.items():
+            stats[name] = {
+                'count': count,
+                'total': total,
+                'max': max_,
+                'histogram': list(histogram),
+            }
+        return stats
+
+
 class Chart(QWidget):
     _item_class = ChartItem
+    _stats = None  # ChartStats, if enabled
+    _clock = staticmethod(timeit.default_timer)  # seconds, for timings
+
+    """Signal emitted when a value is recorded in the statistics.
+
+    The arguments are the name of the distribution and the value (for
+    durations, in milliseconds).  Only emitted if statistics are
+    enabled; see ``setStatsEnabled``.
+    """
+    statsRecorded = Signal(str, float)
+
+    _updatesPosted = Signal()  # emitted when posted updates are pending
 
     @classmethod
     def _check_item(cls, item):
@@ -60,26 +137,63 @@ class Chart(QWidget):
 
         Raise an exception if the item list is not valid.
         """
-        if any(items.count(item) > 1 for item in items):
+        if len(set(id(item) for item in items)) != len(items):
             raise ValueError('Item appears multiple times in list.')
         return items
 
     def __init__(self, parent=None, items=None):
         super(Chart, self).__init__(parent=parent)
         self._items = []
+        self._index = {}  # id(item) -> position of item in self._items
+        self._version = 0  # incremented whenever the items change
+        self._update_depth = 0  # nesting level of beginUpdate calls
+        self._update_pending = False  # items changed during batch update
+        self._update_snapshot = None  # items before the batch update
+        self._update_states = None  # id(item) -> (item, state) to restore
+        self._model = None
+        self._model_columns = None  # (label column, value column)
+        self._post_lock = threading.Lock()
+        self._posted = collections.OrderedDict()  # key -> posted update
+        self._updatesPosted.connect(
+            self._apply_posted, Qt.QueuedConnection)
         if items:
             self.setChartItems(items)
 
+    def _reindex(self, start=0):
+        """Update the item index from position ``start`` onwards."""
+        for i in xrange(start, len(self._items)):
+            self._index[id(self._items[i])] = i
+
     def setChartItems(self, items):
         """Set the list of ``PieChartItem``s."""
         items = [self._check_item(item) for item in items]
         self._items = self._check_items(items)
-        self.update()  # repaint
+        self._index = {}
+        self._reindex()
+        self._items_changed()
 
     def chartItems(self):
-        """Return the list of ``ChartItem``s."""
+        """Return the list of ``ChartItem``s.
+
+        The list must not be modified directly; use ``setChartItems``,
+        ``addChartItem`` and ``removeChartItem`` instead.
+        """
         return self._items
 
+    def hasChartItem(self, item):
+        """Return whether the ``ChartItem`` is in this chart."""
+        return id(item) in self._index
+
+    def chartItemIndex(self, item):
+        """Return the index of the given ``ChartItem``.
+
+        Raise ``ValueError`` if the item is not in this chart.
+        """
+        try:
+            return self._index[id(item)]
+        except KeyError:
+            raise ValueError('Item is not in the chart.')
+
     def addChartItem(self, item, index=-1):
         """Add a ``ChartItem`` to this chart.
 
@@ -92,15 +206,44 @@ class Chart(QWidget):
         The same item cannot be added to the list multiple times.
         """
         self._check_item(item)
-        if item in self._items:
+        if self.hasChartItem(item):
             raise ValueError('Item is already in the chart.')
-        if self._items is None:
-            self._items = [item]
-        elif index < 0:
+        if index < 0 or index >= len(self._items):
             self._items.append(item)
+            self._index[id(item)] = len(self._items) - 1
         else:
             self._items.insert(index, item)
-        self.update()  # repaint
+            self._reindex(index)
+        self._items_changed()
+
+    def insertChartItems(self, index, items):
+        """Insert several ``ChartItem``s into this chart at ``index``.
+
+        Equivalent to adding each item with ``addChartItem``, but the
+        chart is only updated once.
+        """
+        items = [self._check_item(item) for item in items]
+        self._check_items(items)
+        for item in items:
+            if self.hasChartItem(item):
+                raise ValueError('Item is already in the chart.')
+        index = max(0, min(index, len(self._items)))
+        self._items[index:index] = items
+        self._reindex(index)
+        self._items_changed()
+
+    def removeChartItems(self, index, count):
+        """Remove ``count`` ``ChartItem``s from this chart from ``index``.
+
+        Return the list of removed items.
+        """
+        items = self._items[index:index + count]
+        del self._items[index:index + count]
+        for item in items:
+            del self._index[id(item)]
+        self._reindex(index)
+        self._items_changed()
+        return items
 
     def removeChartItem(self, index):
         """Remove a ``ChartItem`` from this ``PieChart``.
@@ -112,5 +255,343 @@ class Chart(QWidget):
         Return the removed item.
         """
         item = self._items.pop(index)
-        self.update()
+        del self._index[id(item)]
+        self._reindex(index if index >= 0 else len(self._items) + index + 1)
+        self._items_changed()
         return item
+
+    def updateChartItems(self):
+        """Notify the chart that its items were modified in place.
+
+        Call this after changing attributes of items that are in the
+        chart, so that any derived state is recomputed and the chart is
+        repainted.
+        """
+        self._items_changed()
+
+    def beginUpdate(self):
+        """Begin a batch update of the items.
+
+        Until the matching ``endUpdate``, changes to the items do not
+        cause the chart to be validated as a whole, recomputed or
+        repainted.  Each item is still checked as it is added.  Batch
+        updates may be nested.
+        """
+        if not self._update_depth:
+            self._update_snapshot = list(self._items)
+            self._update_states = {}
+            self._update_pending = False
+        self._update_depth += 1
+
+    def endUpdate(self):
+        """End a batch update of the items.
+
+        When the outermost batch update ends, the item list is checked
+        and the chart is updated once.  If the check fails, the items
+        are restored to the list (and items changed in place, to their
+        state) from before ``beginUpdate``, and the exception is raised.
+        """
+        if not self._update_depth:
+            raise RuntimeError('endUpdate called without beginUpdate.')
+        self._update_depth -= 1
+        if self._update_depth or not self._update_pending:
+            return
+        try:
+            self._check_items(self._items)
+        except:
+            self._restore_snapshot()
+            raise
+        self._update_snapshot = self._update_states = None
+        self._update_pending = False
+        self._items_changed()
+
+    @contextlib.contextmanager
+    def batchUpdate(self):
+        """Context manager for a batch update of the items.
+
+        See ``beginUpdate``.  If an exception is raised within the
+        context, the items are restored to the list from before the
+        batch update.
+        """
+        self.beginUpdate()
+        try:
+            yield self
+        except:
+            self._update_depth -= 1
+            if not self._update_depth:
+                self._restore_snapshot()
+            raise
+        self.endUpdate()
+
+    def _restore_snapshot(self):
+        """Restore the items from before the outermost batch update."""
+        for item, state in self._update_states.values():
+            self._restore_item_state(item, state)
+        self._items = self._update_snapshot
+        self._index = {}
+        self._reindex()
+        self._update_snapshot = self._update_states = None
+        if self._update_pending:
+            self._update_pending = False
+            self._items_changed()
+
+    def postUpdate(self, update, key=None):
+        """Post an update of the chart; may be called from any thread.
+
+        update
+          A callable, which will be called with the chart as its
+          argument, in the thread of the chart.
+        key
+          If given, an update posted with the same key that has not yet
+          been applied is discarded, as it is superseded.
+
+        Posted updates are applied in order, in a single batch update,
+        the next time the event loop of the thread of the chart runs.
+        If an update raises an exception, or the items are not valid at
+        the end, the whole batch is rolled back; see ``batchUpdate``.
+        Posting never waits for the chart to be updated or painted.
+        """
+        self._post(update, key)
+
+    def postChartItems(self, items):
+        """Post ``setChartItems(items)``; may be called from any thread.
+
+        Any updates posted before that have not yet been applied are
+        discarded.  See ``postUpdate``.
+        """
+        self._post(lambda chart: chart.setChartItems(items), None, True)
+
+    def _post(self, update, key, replace=False):
+        """Add an update to the posted updates.
+
+        If ``replace`` is true, the pending updates are discarded.
+        """
+        if key is None:
+            key = object()  # never superseded
+        with self._post_lock:
+            scheduled = bool(self._posted)
+            if replace:
+                self._posted.clear()
+            else:
+                self._posted.pop(key, None)
+            self._posted[key] = update
+        if not scheduled:
+            self._updatesPosted.emit()
+
+    def _apply_posted(self):
+        """Apply the posted updates."""
+        with self._post_lock:
+            updates = list(self._posted.values())
+            self._posted = collections.OrderedDict()
+        if updates:
+            with self.batchUpdate():
+                for update in updates:
+                    update(self)
+
+    def setModel(self, model, labelColumn=0, valueColumn=1):
+        """Bind the chart to a ``QAbstractItemModel``.
+
+        The chart's items are kept in step with the rows of the model
+        (top-level rows only): inserted and removed rows insert and
+        remove the corresponding items, and changed rows update them, so
+        only the affected items are touched.
+
+        If the model provides ``ChartItem``s under ``ItemRole`` (see
+        ``model.ChartItemModel``), those items are used directly.
+        Otherwise an item is created for each row, with its label from
+        the display role of ``labelColumn`` and its value from the edit
+        role of ``valueColumn``; see ``_item_from_model``.
+
+        Pass ``None`` to unbind the chart from its model; the items
+        remain.
+        """
+        if self._model is not None:
+            self._model.rowsInserted.disconnect(self._model_rows_inserted)
+            self._model.rowsRemoved.disconnect(self._model_rows_removed)
+            self._model.dataChanged.disconnect(self._model_data_changed)
+            self._model.modelReset.disconnect(self._model_reset)
+            self._model.layoutChanged.disconnect(self._model_reset)
+            self._model.rowsMoved.disconnect(self._model_reset)
+        self._model = model
+        self._model_columns = labelColumn, valueColumn
+        if model is not None:
+            model.rowsInserted.connect(self._model_rows_inserted)
+            model.rowsRemoved.connect(self._model_rows_removed)
+            model.dataChanged.connect(self._model_data_changed)
+            model.modelReset.connect(self._model_reset)
+            model.layoutChanged.connect(self._model_reset)
+            model.rowsMoved.connect(self._model_reset)
+            self._model_reset()
+
+    def model(self):
+        """Return the model the chart is bound to, or ``None``."""
+        return self._model
+
+    def _item_from_model(self, row, item=None):
+        """Return the item for a row of the model.
+
+        If the model provides a ``ChartItem`` under ``ItemRole``, return
+        it.  Otherwise, set the attributes of ``item`` from the model
+        (creating a new item if ``item`` is ``None``) and return it.
+        """
+        label_column, value_column = self._model_columns
+        model_item = self._model.data(
+            self._model.index(row, label_column), ItemRole)
+        if isinstance(model_item, ChartItem):
+            return model_item
+        if item is None:
+            item = self._item_class()
+        self._set_item_values(
+            item,
+            self._model.data(
+                self._model.index(row, label_column), Qt.DisplayRole),
+            self._model.data(
+                self._model.index(row, value_column), Qt.EditRole)
+        )
+        return item
+
+    def _set_item_values(self, item, label, value):
+        """Set the attributes of an item created for a row of the model."""
+        item.label = label
+        item.value = value
+
+    def _model_reset(self, *args):
+        self.setChartItems([
+            self._item_from_model(row)
+            for row in xrange(self._model.rowCount())
+        ])
+
+    def _model_rows_inserted(self, parent, first, last):
+        if not parent.isValid():
+            self.insertChartItems(first, [
+                self._item_from_model(row)
+                for row in xrange(first, last + 1)
+            ])
+
+    def _model_rows_removed(self, parent, first, last):
+        if not parent.isValid():
+            self.removeChartItems(first, last - first + 1)
+
+    def _model_data_changed(self, top_left, bottom_right):
+        if top_left.parent().isValid():
+            return
+        start, stop = top_left.row(), bottom_right.row() + 1
+        items = self._items[start:stop]
+        # items provided by the model are changed by the model itself,
+        # so only the items created by the chart can be restored
+        states = [self._item_state(item) for item in items]
+        try:
+            for row, item in itertools.izip(xrange(start, stop), items):
+                self._save_item_state(item)
+                if self._item_from_model(row, item) is not item:
+                    raise ValueError('Model item changed; reset the model.')
+                self._check_item(item)
+            # within a batch update, the items are checked by endUpdate
+            if not self._update_depth:
+                self._check_changed_items(start, stop)
+        except:
+            for item, state in itertools.izip(items, states):
+                self._restore_item_state(item, state)
+            raise
+        self._items_updated(start, stop)
+
+    def _item_state(self, item):
+        """Return the attributes of ``item`` that may change in place.
+
+        See ``_restore_item_state``.
+        """
+        return item.label, item.value
+
+    def _restore_item_state(self, item, state):
+        """Restore attributes of ``item`` returned by ``_item_state``."""
+        item.label, item.value = state
+
+    def _save_item_state(self, item):
+        """Record the state of ``item`` before it is changed in place.
+
+        Within a batch update, the item is restored to its first
+        recorded state if the batch update fails.
+        """
+        if self._update_depth and id(item) not in self._update_states:
+            self._update_states[id(item)] = item, self._item_state(item)
+
+    def _check_changed_items(self, start, stop):
+        """Check the items after those from ``start`` to ``stop`` changed.
+
+        Raise an exception if the items are no longer valid.  Subclasses
+        may check the changed items against the others without checking
+        the whole list.
+        """
+        self._check_items(self._items)
+
+    def _items_updated(self, start, stop):
+        """Called when the items from ``start`` to ``stop`` were changed
+        in place and checked.
+
+        Subclasses may update only the state derived from those items.
+        """
+        self._items_changed()
+
+    def setStatsEnabled(self, enabled):
+        """Set whether the chart records statistics.
+
+        When enabled, the chart counts and times its work, such as
+        painting, for ``stats``.  Enabling statistics resets them.
+        Disabled by default, when the cost is negligible.
+        """
+        self._stats = ChartStats() if enabled else None
+
+    def isStatsEnabled(self):
+        """Return whether the chart records statistics."""
+        return self._stats is not None
+
+    def stats(self):
+        """Return the statistics recorded by the chart, as a dict.
+
+        Return ``None`` if statistics are not enabled.  See
+        ``ChartStats.as_dict``.  Durations are in milliseconds.
+        """
+        return None if self._stats is None else self._stats.as_dict()
+
+    def resetStats(self):
+        """Discard the statistics recorded so far."""
+        if self._stats is not None:
+            self._stats = ChartStats()
+
+    def _record(self, name, value):
+        """Record a value in the statistics, which must be enabled."""
+        self._stats.record(name, value)
+        self.statsRecorded.emit(name, value)
+
+    def _record_time(self, name, start):
+        """Record the time since ``start`` (see ``_clock``), in ms."""
+        self._record(name, (self._clock() - start) * 1000)
+
+    def _items_changed(self, region=None):
+        """Called whenever the items or their attributes have changed.
+
+        Within a batch update, this is deferred until ``endUpdate``.
+
+        region
+          The ``QRegion`` of the widget affected by the change, if
+          known.  Only this region is repainted.
+        """
+        if self._update_depth:
+            self._update_pending = True
+            return
+        if self._stats is not None:
+            self._stats.count('items_changed')
+        self._invalidate(region)
+        self._version += 1
+        if region is None:
+            self.update()  # repaint
+        else:
+            self.update(region)
+
+    def _invalidate(self, region=None):
+        """Discard any state derived from the items.
+
+        Subclasses that cache state derived from the items should
+        override this.  ``region`` is as for ``_items_changed``.
+        """
+        pass
@@ -0,0 +1,344 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Geometry of pie charts, without Qt.
+
+Positive angles are counter-clockwise.  Angle of zero is the 3 o'clock
+position.  Angles are in Qt terms (16ths of a degree), but this module
+does not import Qt, so it can be used where Qt is not wanted; the
+``piechart`` module builds its widgets on it.
+
+The angle and geometry functions accept NumPy arrays as well as numbers,
+if NumPy is available.
+"""
+
+from __future__ import division
+
+import bisect
+import itertools
+import math
+import sys
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _is_array(x):
+    """Return whether ``x`` is a NumPy array."""
+    return numpy is not None and isinstance(x, numpy.ndarray)
+
+
+def fraction_to_angle(fraction):
+    """Convert a fraction to an angle (in Qt terms).
+
+    Qt understands angels in 16ths-of-a-degree (i.e., one revolution is
+    5760).
+    """
+    return fraction * 360 * 16
+
+
+def angle_to_fraction(angle):
+    """Convert an angle (in Qt terms) to a fraction."""
+    return angle / 16 / 360
+
+
+def theta_to_angle(theta):
+    """Convert an angle in radians to an angle in Qt terms."""
+    return theta * 360 / (2 * math.pi) * 16
+
+
+def angle_to_theta(angle):
+    """Convert an angle in Qt terms to radians."""
+    return angle / 16 / 360 * (2 * math.pi)
+
+
+def opposite_angle(angle):
+    """Determine the opposite angle to the angle given, in Qt terms."""
+    angle = angle + 180 * 16
+    if _is_array(angle):
+        return numpy.where(angle >= 360 * 16, angle - 360 * 16, angle)
+    if angle >= 360 * 16:
+        angle -= 360 * 16
+    return angle
+
+
+def slice_angles(fractions):
+    """Return the start angles and spans of slices, in Qt terms.
+
+    Return ``(starts, spans)``.  If ``fractions`` is a NumPy array, so
+    are the results, otherwise they are lists.
+    """
+    if _is_array(fractions):
+        spans = fraction_to_angle(fractions.astype(float))
+        starts = numpy.empty_like(spans)
+        if len(spans):
+            starts[0] = 0
+            numpy.cumsum(spans[:-1], out=starts[1:])
+        return starts, spans
+    starts = []
+    spans = []
+    angle = 0
+    for fraction in fractions:
+        span = fraction_to_angle(fraction)
+        starts.append(angle)
+        spans.append(span)
+        angle += span
+    return starts, spans
+
+
+def boundary_points(starts, spans, origin, radius):
+    """Return the angles and coordinates of the ends of slices.
+
+    starts, spans
+      The start angles and spans of the slices, in Qt terms; see
+      ``slice_angles``.
+    origin, radius
+      As for ``cartesian``.
+
+    Return ``(angles, xs, ys)``.  If NumPy is available, the points are
+    computed in one vectorised call and the results are arrays,
+    otherwise they are lists.
+    """
+    if numpy is not None:
+        angles = numpy.add(starts, spans, dtype=float)
+        xs, ys = cartesian(angles, origin, radius)
+        return angles, xs, ys
+    angles = [start + span for start, span in itertools.izip(starts, spans)]
+    points = [cartesian(angle, origin, radius) for angle in angles]
+    return angles, [x for x, y in points], [y for x, y in points]
+
+
+def cartesian(angle, origin, radius):
+    """Return the point on a circle at the given angle, as (x, y).
+
+    angle
+      The angle, in Qt terms.
+    origin
+      The origin of the circle, as tuple (x, y), in widget coordinates.
+    radius
+      The radius of the circle.
+    """
+    theta = angle_to_theta(angle)
+    x, y = origin
+    if _is_array(theta):
+        return x + radius * numpy.cos(theta), y - radius * numpy.sin(theta)
+    return x + radius * math.cos(theta), y - radius * math.sin(theta)
+
+
+def polar(x, y, origin):
+    """Convert widget coordinates to polar coordinates about ``origin``.
+
+    Return (radius, angle) (angle in Qt terms, in range ``0..5760``).
+    """
+    rel_x = x - origin[0]
+    rel_y = origin[1] - y
+    if _is_array(rel_x) or _is_array(rel_y):
+        theta = numpy.arctan2(rel_y, rel_x)
+        theta = numpy.where(theta >= 0, theta, theta + math.pi * 2)
+        return numpy.hypot(rel_x, rel_y), theta_to_angle(theta)
+    theta = math.atan2(rel_y, rel_x)
+    theta = theta if theta >= 0 else theta + math.pi * 2
+    return math.hypot(rel_x, rel_y), theta_to_angle(theta)
+
+
+def normalise(values):
+    """Return the fractions of the total of ``values``, and the total.
+
+    The values must be non-negative numbers.  Return ``(fractions,
+    total)``, where ``fractions`` is a list.  If the total is ``0``, all
+    the fractions are ``0``.  The total is summed exactly, but the
+    fractions are scaled down if their naive sum (as charts sum them)
+    would round up over 1, so it is never greater than 1.
+    """
+    values = list(values)
+    total = math.fsum(values)
+    if not total:
+        return [0] * len(values), total
+    fractions = [value / total for value in values]
+    if sum(fractions) > 1:
+        # scale down by the most the sum can round up, n units in the
+        # last place
+        scale = 1 / (1 + len(fractions) * sys.float_info.epsilon)
+        fractions = [fraction * scale for fraction in fractions]
+    return fractions, total
+
+
+def clamp_angle(angle, base_angle, max_angle):
+    """Clamp the angle of a pointer adjusting a slice boundary.
+
+    The boundary between two slices can move from the start of the first
+    slice, ``base_angle``, to the end of the second, ``max_angle``.  An
+    angle outside that range is moved to whichever end the pointer went
+    past, i.e. the end on the same side of the line opposite the middle
+    of the range.  All angles are in Qt terms.
+    """
+    if base_angle <= angle <= max_angle:
+        return angle
+    midline = opposite_angle((max_angle + base_angle) / 2)
+    if midline < 180 * 16 and 0 <= angle < midline:
+        return max_angle
+    elif midline >= 180 * 16 and midline <= angle <= 360 * 16:
+        return base_angle
+    elif angle < base_angle:
+        return base_angle
+    return max_angle
+
+
+class PieLayout(object):
+    """The geometry of the slices of a pie chart.
+
+    A layout is computed from the fractions of the items, the origin and
+    the radius of the chart.  Charts keep their layout until the items
+    change or the widget is resized.  See also ``piechart.PieLayout``,
+    which adds the geometry Qt needs to paint the slices.
+    """
+
+    def __init__(self, fractions, origin, radius):
+        """Initialise the layout.
+
+        fractions
+          Iterable (or NumPy array) of the fractions of the slices, in
+          order.
+        origin
+          The origin of the chart, as tuple (x, y).
+        radius
+          The radius of the chart.
+        """
+        self.origin = origin
+        self.radius = radius
+
+        """Start angle and span of each slice, in Qt terms."""
+        if not _is_array(fractions):
+            fractions = list(fractions)
+            if numpy is not None:
+                fractions = numpy.array(fractions, dtype=float)
+        starts, spans = slice_angles(fractions)
+        if _is_array(starts):
+            starts, spans = starts.tolist(), spans.tolist()
+        self.starts = starts
+        self.spans = spans
+
+        """Grips, as ``(x, y, angle, item)``; see ``AdjustablePieChart``.
+
+        ``grip_angles`` holds the angle of each grip, in ascending
+        order, for bisection.
+        """
+        self.grips = []
+        self.grip_angles = []
+
+        self._wedges = {}  # threshold -> wedges; see ``wedges``
+
+    def cartesian(self, angle):
+        """Return the point on the circumference at the given angle.
+
+        angle
+          The angle, in Qt terms.
+        """
+        return cartesian(angle, self.origin, self.radius)
+
+    def wedges(self, threshold):
+        """Return the wedges to paint, aggregating narrow slices.
+
+        Runs of two or more consecutive slices whose arcs are each
+        shorter than ``threshold`` pixels are merged into one wedge, so
+        the number of wedges is bounded by the size of the chart rather
+        than the number of slices.  Slices of zero span are omitted.
+
+        Return a list of ``(start, span, index)``, where ``index`` is
+        the index of the slice, or ``None`` for an aggregated wedge.
+        The result is cached.
+        """
+        try:
+            return self._wedges[threshold]
+        except KeyError:
+            pass
+        # threshold, as an angle in Qt terms
+        limit = theta_to_angle(threshold / self.radius) \
+            if self.radius > 0 else float('inf')
+        wedges = []
+        run_start = run_end = None  # the current run of narrow slices
+        run_count = 0
+        for i, (start, span) in \
+                enumerate(itertools.izip(self.starts, self.spans)):
+            if span <= 0:
+                continue
+            if span < limit:
+                if run_count == 0:
+                    run_start = start
+                run_end = start + span
+                run_count += 1
+                last = i
+                continue
+            if run_count:
+                wedges.append((
+                    run_start,
+                    run_end - run_start,
+                    None if run_count > 1 else last
+                ))
+                run_count = 0
+            wedges.append((start, span, i))
+        if run_count:
+            wedges.append((
+                run_start,
+                run_end - run_start,
+                None if run_count > 1 else last
+            ))
+        self._wedges[threshold] = wedges
+        return wedges
+
+    def slice_at(self, angle):
+        """Return the index of the slice at the given angle, or ``None``.
+
+        The start angles are bisected, so this is logarithmic in the
+        number of slices.
+
+        angle
+          The angle, in Qt terms, in range ``0..5760``.
+        """
+        # the last slice starting at or before the angle; slices of zero
+        # span are skipped, as a following slice has the same start
+        index = bisect.bisect_right(self.starts, angle) - 1
+        if index < 0 or angle >= self.starts[index] + self.spans[index]:
+            return None
+        return index
+
+    def wedge_bounds(self, start, span):
+        """Return the bounding box of a wedge of the chart.
+
+        start, span
+          The start angle and span of the wedge, in Qt terms.
+
+        Return ``(left, top, right, bottom)``.
+        """
+        if span >= fraction_to_angle(1):
+            x, y = self.origin
+            r = self.radius
+            return x - r, y - r, x + r, y + r
+
+        # the wedge is bounded by the origin, the ends of its arc, and
+        # the points where the arc crosses an axis
+        points = [self.origin, self.cartesian(start)]
+        quarter = fraction_to_angle(0.25)
+        angle = (math.floor(start / quarter) + 1) * quarter
+        while angle < start + span:
+            points.append(self.cartesian(angle))
+            angle += quarter
+        points.append(self.cartesian(start + span))
+        xs, ys = zip(*points)
+        return min(xs), min(ys), max(xs), max(ys)
@@ -0,0 +1,80 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Binary indexed (Fenwick) tree.
+"""
+
+
+class FenwickTree(object):
+    """A sequence of numbers supporting fast prefix sums.
+
+    Setting a value, appending a value, and computing the sum of a
+    prefix of the sequence are all O(log n).
+    """
+    def __init__(self, values=()):
+        """Initialise the tree from the iterable ``values``, in O(n)."""
+        self._values = list(values)
+        n = len(self._values)
+        self._tree = [0] + self._values
+        for i in xrange(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __setitem__(self, index, value):
+        if index < 0:
+            index += len(self._values)
+        delta = value - self._values[index]
+        self._values[index] = value
+        n = len(self._values)
+        i = index + 1
+        while i <= n:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index):
+        """Return the sum of the values before ``index``."""
+        total = 0
+        i = min(index, len(self._values))
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def total(self):
+        """Return the sum of all the values."""
+        return self.prefix_sum(len(self._values))
+
+    def append(self, value):
+        """Append a value."""
+        self._values.append(value)
+        i = len(self._values)
+        # the new node covers the values (i - lowbit(i), i]
+        self._tree.append(
+            value + self.prefix_sum(i - 1) - self.prefix_sum(i - (i & -i)))
+
+    def pop(self):
+        """Remove and return the last value."""
+        value = self._values.pop()  # raises IndexError if empty
+        self._tree.pop()
+        return value
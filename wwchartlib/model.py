@@ -0,0 +1,121 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Qt item model of chart items.
+"""
+
+from PySide.QtCore import *
+
+from . import chart
+
+
+class ChartItemModel(QAbstractListModel):
+    """A list model of ``ChartItem``s.
+
+    Each row is an item.  The display role is the item's label (via
+    ``unicode``), the edit role its value, and ``ItemRole`` the item
+    itself, so a chart bound to the model with ``Chart.setModel`` shares
+    the model's items.
+
+    Modify the list with the methods of this model, so that views and
+    charts are notified.  After modifying the attributes of an item in
+    place, call ``itemChanged``.
+    """
+    ItemRole = chart.ItemRole
+
+    def __init__(self, items=None, parent=None):
+        super(ChartItemModel, self).__init__(parent)
+        self._items = list(items or [])
+        self._index = {}  # id(item) -> row
+        self._reindex()
+
+    def _reindex(self, start=0):
+        for row in xrange(start, len(self._items)):
+            self._index[id(self._items[row])] = row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        item = self._items[index.row()]
+        if role == Qt.DisplayRole:
+            return None if item.label is None else unicode(item.label)
+        if role == Qt.EditRole:
+            return item.value
+        if role == self.ItemRole:
+            return item
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        self._items[index.row()].value = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        flags = super(ChartItemModel, self).flags(index)
+        return flags | Qt.ItemIsEditable if index.isValid() else flags
+
+    def items(self):
+        """Return the list of items.  It must not be modified."""
+        return self._items
+
+    def item(self, row):
+        """Return the item at ``row``."""
+        return self._items[row]
+
+    def insertItems(self, row, items):
+        """Insert the items at ``row``."""
+        items = list(items)
+        if not items:
+            return
+        row = max(0, min(row, len(self._items)))
+        self.beginInsertRows(QModelIndex(), row, row + len(items) - 1)
+        self._items[row:row] = items
+        self._reindex(row)
+        self.endInsertRows()
+
+    def appendItem(self, item):
+        """Append an item."""
+        self.insertItems(len(self._items), [item])
+
+    def removeItems(self, row, count):
+        """Remove ``count`` items from ``row``."""
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        for item in self._items[row:row + count]:
+            del self._index[id(item)]
+        del self._items[row:row + count]
+        self._reindex(row)
+        self.endRemoveRows()
+
+    def setItems(self, items):
+        """Replace all the items."""
+        self.beginResetModel()
+        self._items = list(items)
+        self._index = {}
+        self._reindex()
+        self.endResetModel()
+
+    def itemChanged(self, item):
+        """Notify views that the item's attributes have changed."""
+        index = self.index(self._index[id(item)], 0)
+        self.dataChanged.emit(index, index)
@@ -0,0 +1,132 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Colour palettes for charts.
+
+A colour scheme is a function which, given a number of slices ``n``,
+returns an iterable of ``n`` ``QColor``s.  Colour tables generated by
+the schemes are cached and shared by all charts, so the ``QColor``s
+returned by this module must not be modified.
+"""
+
+from __future__ import division
+
+import collections
+import math
+
+from PySide.QtGui import *
+
+
+def hsv(n):
+    """Colours evenly spaced around the HSV colour cylinder.
+
+    The hues are as distinct as possible, with set saturation and
+    value.
+    """
+    hue_delta = 360 / n if n else 0
+    hue = 0
+    for i in xrange(n):
+        yield QColor.fromHsv(int(math.floor(hue)), 191, 255)
+        hue += hue_delta
+
+
+def golden(n):
+    """Colours whose hues are successive multiples of the golden angle.
+
+    Each colour is independent of ``n``, so adding slices does not
+    change the colours of the existing ones, and neighbouring colours
+    are always distinct.
+    """
+    golden_angle = 180 * (3 - math.sqrt(5))
+    for i in xrange(n):
+        yield QColor.fromHsv(int(math.floor(i * golden_angle % 360)), 191, 255)
+
+
+_schemes = {'hsv': hsv, 'golden': golden}
+
+
+def register_scheme(name, scheme):
+    """Register a colour scheme under the given name."""
+    _schemes[name] = scheme
+    _tables.clear()
+
+
+def schemes():
+    """Return the names of the registered colour schemes."""
+    return sorted(_schemes)
+
+
+class _LRUCache(object):
+    """A mapping that keeps only the most recently used entries."""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+
+    def get(self, key):
+        """Return the value for ``key``, or ``None``."""
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            return None
+        self._data[key] = value  # most recently used
+        return value
+
+    def put(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+_tables = _LRUCache(64)
+
+
+def colour_table(n, scheme='hsv'):
+    """Return a tuple of ``n`` ``QColor``s of the named scheme.
+
+    Tables are cached, so repeated calls with the same arguments do not
+    allocate any colours.
+    """
+    key = n, scheme
+    table = _tables.get(key)
+    if table is None:
+        if scheme not in _schemes:
+            raise ValueError('Unknown colour scheme {!r}.'.format(scheme))
+        table = tuple(_schemes[scheme](n))
+        _tables.put(key, table)
+    return table
+
+
+def colour(index, scheme='golden'):
+    """Return the colour at ``index`` of the named scheme.
+
+    Used for stable colour assignment, where each new slice takes the
+    next colour, so the colours of the scheme must not depend on the
+    number of slices (like ``golden``).  The scheme's table is grown (by
+    doubling) as needed, and only the largest table is kept.
+    """
+    table = _tables.get(('stable', scheme))
+    if table is None or index >= len(table):
+        if scheme not in _schemes:
+            raise ValueError('Unknown colour scheme {!r}.'.format(scheme))
+        size = max(16, 2 * len(table or ()), index + 1)
+        table = tuple(_schemes[scheme](size))
+        _tables.put(('stable', scheme), table)
+    return table[index]
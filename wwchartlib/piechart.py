@@ -17,55 +17,137 @@
 """
 Pie chart widget.
 
-Positive angles are counter-clockwise.  Angle of zero is the 3 o'clock
-position.
+The angle and geometry functions are those of ``core``, which does not
+depend on Qt; they are available here too.
 """
 
 from __future__ import division
 
+import array
+import bisect
+import contextlib
 import itertools
 import math
 import numbers
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from PySide.QtCore import *
 from PySide.QtGui import *
 
+from . import animation
 from . import chart
+from . import core
+from . import fenwick
+from . import palette
+from .core import (
+    _is_array,
+    angle_to_fraction,
+    angle_to_theta,
+    boundary_points,
+    cartesian,
+    clamp_angle,
+    fraction_to_angle,
+    normalise,
+    opposite_angle,
+    polar,
+    slice_angles,
+    theta_to_angle,
+)
+
+
+def colours(n, scheme='hsv'):
+    """An iterator of ``n`` ``QColor`` objects for the slices of a pie chart.
+
+    By default, in the HSV colour space, the colours will be evenly
+    spaced around the cylinder (i.e., the hues will be as distinct as
+    possible), with set saturation and value.  See ``palette``.
+    """
+    return iter(palette.colour_table(n, scheme))
 
 
-def fraction_to_angle(fraction):
-    """Convert a fraction to an angle (in Qt terms).
+"""The colour of wedges that aggregate several slices."""
+AGGREGATE_COLOUR = QColor(191, 191, 191)
 
-    Qt understands angels in 16ths-of-a-degree (i.e., one revolution is
-    5760).
-    """
-    return fraction * 360 * 16
 
+def paint_slices(p, layout, colours, region=None, threshold=0):
+    """Paint the slices of a pie chart with the given ``QPainter``.
 
-def angle_to_fraction(angle):
-    """Convert an angle (in Qt terms) to a fraction."""
-    return angle / 16 / 360
+    The painter may be painting on any ``QPaintDevice``.
 
+    layout
+      The ``PieLayout`` of the slices.
+    colours
+      Sequence of the ``QColor`` of each slice.
+    region
+      If given, slices outside this ``QRegion`` are skipped.
+    threshold
+      If non-zero, runs of slices narrower than this many pixels (along
+      the circumference) are painted as one wedge, in
+      ``AGGREGATE_COLOUR``; see ``PieLayout.wedges``.
+    """
+    p.setRenderHint(QPainter.RenderHint.Antialiasing)
+    pen = QPen()
+    pen.setWidth(2)
+    p.setPen(pen)
+    rect = layout.rect
+
+    if threshold:
+        wedges = layout.wedges(threshold)
+    else:
+        wedges = itertools.izip(
+            layout.starts, layout.spans, itertools.count())
+    for start, span, index in wedges:
+        if span > 0:
+            if region is not None and not region.intersects(
+                    layout.wedge_rect(start, span)):
+                continue
+            colour = AGGREGATE_COLOUR if index is None else colours[index]
+            p.setBrush(QBrush(colour))
+            p.drawPie(rect, start, span)
+
+
+class PieLayout(core.PieLayout):
+    """The geometry of the slices of a pie chart, for painting with Qt.
+
+    See ``core.PieLayout``.
+    """
+    margin = 2  # room for the outline of the slices, in pixels
 
-def theta_to_angle(theta):
-    """Convert an angle in radians to an angle in Qt terms."""
-    return theta * 360 / (2 * math.pi) * 16
+    def __init__(self, fractions, origin, radius):
+        super(PieLayout, self).__init__(fractions, origin, radius)
 
+        """The bounding square of the chart, as a ``QRect``."""
+        x, y = origin
+        self.rect = QRect(x - radius, y - radius, radius * 2, radius * 2)
 
-def angle_to_theta(angle):
-    """Convert an angle in Qt terms to radians."""
-    return angle / 16 / 360 * (2 * math.pi)
+    def wedge_rect(self, start, span):
+        """Return the bounding ``QRect`` of a wedge of the chart.
+
+        The rect is enlarged by ``margin`` to include the outline.
+
+        start, span
+          The start angle and span of the wedge, in Qt terms.
+        """
+        m = self.margin
+        if span >= fraction_to_angle(1):
+            return self.rect.adjusted(-m, -m, m, m)
+        left, top, right, bottom = self.wedge_bounds(start, span)
+        return QRect(
+            QPoint(int(math.floor(left)), int(math.floor(top))),
+            QPoint(int(math.ceil(right)), int(math.ceil(bottom)))
+        ).adjusted(-m, -m, m, m)
 
 
-def opposite_angle(angle):
-    """Determine the opposite angle to the angle given, in Qt terms."""
-    angle += 180 * 16
-    if angle >= 360 * 16:
-        angle -= 360 * 16
-    return angle
+_DEFAULT_COLOUR = QColor(0, 0, 0)
 
 
 class PieChartItem(chart.ChartItem):
+    __slots__ = ('fraction', 'colour')
+
     def __init__(self, fraction=None, **kwargs):
         """Initialise the pie chart item.
 
@@ -79,9 +161,22 @@ class PieChartItem(chart.ChartItem):
 
         Initialised to ``QColor(0, 0, 0)``.  This property is only set
         by ``PieChart``, not read.  Setting it will have no effect, and
-        it will be overwritten when the chart is next painted.
+        it will be overwritten when the chart is next painted.  The
+        colour may be shared with other items and must not be modified.
         """
-        self.colour = QColor(0, 0, 0)
+        self.colour = _DEFAULT_COLOUR
+
+
+class _ItemColours(object):
+    """Sequence of the colours of a list of items, without copying."""
+    def __init__(self, items):
+        self._items = items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index].colour
 
 
 class PieChart(chart.Chart):
@@ -91,23 +186,60 @@ class PieChart(chart.Chart):
     ``QSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.MinimumExpanding)``
     """
     _item_class = PieChartItem
+    _padding = 5  # space between the chart and the edge of the widget
+    _pie_layout = None
+    _cache_enabled = False
+    _cache = None  # QPixmap of the slices
+    _cache_key = None  # (width, height, version) of the cached pixmap
+    _cache_dirty = None  # QRegion of the cached pixmap to repaint
+    _colour_scheme = 'hsv'
+    _stable_scheme = None  # colour scheme for stable colours, if enabled
+    _colour_indices = None  # id(item) -> index of its stable colour
+    _fractions = None  # array('d') of the fractions of the items
+    _tree = None  # FenwickTree of the fractions of the items
+    _fractions_updated = False  # _fractions and _tree already up to date
+    _detail_threshold = 0
+    _hover_enabled = False
+    _hovered = None  # index of the item under the mouse, if highlighted
+    _tool_tips_enabled = False
+    _animation_duration = 0
+    _animation = None  # (start fractions, end fractions, start time)
+    _animated_fractions = None  # fractions shown during the animation
+    _shown = None  # (items, fractions) last laid out, if animated
+    _value_mode = False
+    _value_total = 0  # sum of the values of the items, in value mode
 
     @classmethod
-    def _check_item(cls, item):
-        if not isinstance(item.fraction, numbers.Number):
+    def _check_fraction(cls, fraction):
+        """Check a fraction, raising an exception if it is not valid."""
+        if not isinstance(fraction, numbers.Number):
             raise TypeError('PieChartItem fraction must be a Number.')
-        if item.fraction < 0:
+        if fraction < 0:
             raise ValueError('PieChartItem fraction cannot be less than 0.')
-        if item.fraction > 1:
+        if fraction > 1:
             raise ValueError('PieChartItem fraction cannot be greater than 1.')
+
+    @classmethod
+    def _check_item(cls, item):
+        cls._check_fraction(item.fraction)
         return super(PieChart, cls)._check_item(item)
 
     @classmethod
-    def _check_items(cls, items):
-        if sum(item.fraction for item in items) > 1:
+    def _check_sum(cls, fractions):
+        """Check the sum of an iterable of fractions.
+
+        The fractions are summed in order, one at a time, wherever the
+        sum is checked, so that rounding cannot make a list of fractions
+        valid in one place and not in another.
+        """
+        if sum(fractions) > 1:
             raise ValueError(
                 'Sum of PieChartItem fractions cannot be greater than 1.'
             )
+
+    @classmethod
+    def _check_items(cls, items):
+        cls._check_sum(item.fraction for item in items)
         return super(PieChart, cls)._check_items(items)
 
     @property
@@ -133,7 +265,7 @@ class PieChart(chart.Chart):
         dimension of the widget, so that the graph does not go all the
         way to the edge.
         """
-        return min(self.origin) - 5
+        return min(self.origin) - self._padding
 
     def __init__(self, **kwargs):
         super(PieChart, self).__init__(**kwargs)
@@ -142,66 +274,765 @@ class PieChart(chart.Chart):
             QSizePolicy.MinimumExpanding,
             QSizePolicy.MinimumExpanding
         )
+        # renormalises the values once per event loop iteration
+        self._normalise_timer = QTimer(self)
+        self._normalise_timer.setSingleShot(True)
+        self._normalise_timer.timeout.connect(self.updateChartItems)
 
-    def setChartItems(self, *args, **kwargs):
-        super(PieChart, self).setChartItems(*args, **kwargs)
-        self._set_colours()
+    def setChartItems(self, items):
+        items = [self._check_item(item) for item in items]
+        with self._cleared_fractions(items):
+            super(PieChart, self).setChartItems(items)
 
-    def addChartItem(self, item, **kwargs):
+    def addChartItem(self, item, index=-1):
         self._check_item(item)
-        if sum((x.fraction for x in self._items), item.fraction) > 1:
-            raise ValueError('PieChartItem fraction is too large.')
-        super(PieChart, self).addChartItem(item, **kwargs)
-        self._set_colours()
+        with self._cleared_fractions([item]):
+            # within a batch update, the sum is checked by endUpdate
+            if not self._update_depth:
+                tree = self._fraction_tree()
+                if tree.total() + item.fraction > 1:
+                    raise ValueError('PieChartItem fraction is too large.')
+                if not self.hasChartItem(item) \
+                        and (index < 0 or index >= len(self._items)):
+                    # appending; update the fractions incrementally
+                    tree.append(item.fraction)
+                    self._fractions_append(item.fraction)
+                    self._fractions_updated = True
+            super(PieChart, self).addChartItem(item, index)
+
+    def insertChartItems(self, index, items):
+        items = [self._check_item(item) for item in items]
+        with self._cleared_fractions(items):
+            # within a batch update, the sum is checked by endUpdate
+            if not self._update_depth and self._fraction_tree().total() \
+                    + sum(item.fraction for item in items) > 1:
+                raise ValueError('PieChartItem fraction is too large.')
+            super(PieChart, self).insertChartItems(index, items)
+
+    def removeChartItem(self, index):
+        if not self._update_depth and self._tree is not None \
+                and self._items and index in (-1, len(self._items) - 1):
+            # removing the last item; update the fractions incrementally
+            self._fractions_pop()
+            self._tree.pop()
+            self._fractions_updated = True
+        return super(PieChart, self).removeChartItem(index)
+
+    def setItemFraction(self, index, fraction):
+        """Set the fraction of the item at ``index``.
+
+        The fraction is checked, and so is the sum of the fractions of
+        all the items, in O(log n).  Only the slices that change are
+        updated; see ``_items_updated``.  Within a batch update, the sum
+        is checked by ``endUpdate``, and the fraction is restored if the
+        batch update fails.  Raise ``RuntimeError`` in value mode.
+        """
+        self._check_fraction_mode()
+        item = self._items[index]
+        if index < 0:
+            index += len(self._items)
+        self._check_fraction(fraction)
+        if not self._update_depth:
+            tree = self._fraction_tree()
+            if tree.total() - tree[index] + fraction > 1:
+                raise ValueError(
+                    'Sum of PieChartItem fractions cannot be greater than 1.'
+                )
+        self._save_item_state(item)
+        item.fraction = fraction
+        self._items_updated(index, index + 1)
+
+    def _item_state(self, item):
+        return super(PieChart, self)._item_state(item), item.fraction
+
+    def _restore_item_state(self, item, state):
+        state, item.fraction = state
+        super(PieChart, self)._restore_item_state(item, state)
+
+    def _check_changed_items(self, start, stop):
+        """Check the changed items, and their sum against the others.
+
+        The sum of the other fractions is found in O(log n).
+        """
+        tree = self._fraction_tree()
+        old = tree.prefix_sum(stop) - tree.prefix_sum(start)
+        new = sum(item.fraction for item in self._items[start:stop])
+        if tree.total() - old + new > 1:
+            raise ValueError(
+                'Sum of PieChartItem fractions cannot be greater than 1.'
+            )
+
+    def _items_updated(self, start, stop):
+        """Update only the slices of the changed items.
+
+        The fractions and the layout are updated in place, the items are
+        not recoloured, and only the wedge covering the changed slices
+        and the slices that move is repainted.
+        """
+        if self._update_depth or self._value_mode \
+                or self._animation_duration:
+            self._items_changed()
+            return
+        for i in xrange(start, stop):
+            fraction = self._items[i].fraction
+            if self._tree is not None:
+                self._tree[i] = fraction
+            if self._fractions is not None:
+                self._fractions[i] = fraction
+        if self._pie_layout is None:
+            # laid out from the fractions when next painted
+            self._items_changed(QRegion(self.rect()))
+        else:
+            self._items_changed(self._update_slices(start, stop))
+
+    def _update_slices(self, start, stop):
+        """Update the layout after the fractions of items changed.
+
+        The spans of the slices from ``start`` to ``stop`` are updated,
+        and the following slices moved.  Return the ``QRegion`` that
+        needs repainting.
+        """
+        layout = self._layout()
+        layout._wedges.clear()  # spans are changing
+        first = angle = layout.starts[start]
+        old_end = layout.starts[stop - 1] + layout.spans[stop - 1]
+        total = layout.starts[-1] + layout.spans[-1]
+        for i in xrange(start, stop):
+            layout.starts[i] = angle
+            layout.spans[i] = fraction_to_angle(self._items[i].fraction)
+            angle += layout.spans[i]
+        end = max(old_end, angle)
+        delta = angle - old_end
+        if delta and stop < len(layout.starts):
+            for i in xrange(stop, len(layout.starts)):
+                layout.starts[i] += delta
+            end = max(total, total + delta)
+        return self._wedge_region(first, end - first)
+
+    def _wedge_region(self, start, span):
+        """Return the ``QRegion`` painted for a wedge of the chart.
+
+        start, span
+          The start angle and span of the wedge, in Qt terms.
+        """
+        return QRegion(self._layout().wedge_rect(start, span))
+
+    def postItemFraction(self, index, fraction):
+        """Post ``setItemFraction(index, fraction)``; thread-safe.
+
+        The fraction itself is checked at once.  The sum of the
+        fractions is checked when the update is applied.  A fraction
+        posted earlier for the same index that has not yet been applied
+        is discarded.  See ``postUpdate``.
+        """
+        self._check_fraction_mode()
+        self._check_fraction(fraction)
+        self.postUpdate(
+            lambda chart: chart.setItemFraction(index, fraction),
+            ('fraction', index)
+        )
+
+    def postChartFractions(self, fractions, labels=None):
+        """Post ``setChartFractions(fractions, labels)``; thread-safe.
+
+        Any updates posted before that have not yet been applied are
+        discarded.  See ``postUpdate``.
+        """
+        self._check_fraction_mode()
+        self._post(
+            lambda chart: chart.setChartFractions(fractions, labels),
+            None,
+            True
+        )
+
+    def setValueMode(self, enabled):
+        """Set whether the fractions of the items follow their values.
+
+        In value mode, the fraction of each item is its ``value`` divided
+        by the sum of the values of all the items, so the values may be
+        any non-negative numbers (``None`` counts as ``0``).  The
+        fractions are set by the chart whenever the items change,
+        replacing the fractions of items added.  Use ``setItemValue`` to
+        change the value of an item; the fractions cannot be set
+        directly, and the slices of an ``AdjustablePieChart`` cannot be
+        dragged.
+        Disabled by default.
+        """
+        self._value_mode = enabled
+        self._items_changed()
+
+    def isValueMode(self):
+        """Return whether the fractions of the items follow their values."""
+        return self._value_mode
+
+    def valueTotal(self):
+        """Return the sum of the values of the items, in value mode."""
+        return self._value_total
+
+    @staticmethod
+    def _item_value(item):
+        """Return the value of the item as counted in value mode."""
+        value = item.value
+        return value if isinstance(value, numbers.Number) and value > 0 \
+            else 0
+
+    def setItemValue(self, index, value):
+        """Set the value of the item at ``index``, in value mode.
+
+        The total of the values is updated in O(1).  The fractions of
+        the items are recomputed, and the chart repainted, once per
+        iteration of the event loop however many values are set.
+        """
+        if value is not None:
+            if not isinstance(value, numbers.Number):
+                raise TypeError('PieChartItem value must be a Number.')
+            if value < 0:
+                raise ValueError('PieChartItem value cannot be less than 0.')
+        item = self._items[index]
+        old = self._item_value(item)
+        self._save_item_state(item)
+        item.value = value
+        if not self._value_mode:
+            self._items_changed()
+            return
+        self._value_total += self._item_value(item) - old
+        if self._update_depth:
+            self._items_changed()  # deferred until endUpdate
+        elif not self._normalise_timer.isActive():
+            self._normalise_timer.start(0)
+
+    def _check_fraction_mode(self):
+        """Raise ``RuntimeError`` if the fractions follow the values."""
+        if self._value_mode:
+            raise RuntimeError('Fractions cannot be set in value mode.')
+
+    @contextlib.contextmanager
+    def _cleared_fractions(self, items):
+        """Set the fractions of items about to be added to ``0``.
+
+        In value mode, the fractions of new items are replaced, so they
+        must not count towards the sum of the fractions.  If the items
+        are not added, their fractions are restored.
+        """
+        if not self._value_mode:
+            yield
+            return
+        cleared = [
+            (item, item.fraction) for item in items
+            if not self.hasChartItem(item)
+        ]
+        for item, fraction in cleared:
+            item.fraction = 0
+        try:
+            yield
+        except Exception:
+            for item, fraction in cleared:
+                item.fraction = fraction
+            raise
+
+    def _normalise_values(self):
+        """Set the fractions of the items from their values."""
+        self._normalise_timer.stop()
+        fractions, self._value_total = normalise(
+            self._item_value(item) for item in self._items)
+        for item, fraction in itertools.izip(self._items, fractions):
+            item.fraction = fraction
+
+    def _fraction_tree(self):
+        """Return the ``FenwickTree`` of the fractions of the items."""
+        if self._tree is None:
+            self._tree = fenwick.FenwickTree(self.chartFractions())
+        return self._tree
+
+    def _fractions_append(self, fraction):
+        """Append to the array of fractions, if there is one."""
+        if self._fractions is not None:
+            try:
+                self._fractions.append(fraction)
+            except BufferError:
+                # array is in use, e.g. by a NumPy view; rebuild it later
+                self._fractions = None
+
+    def _fractions_pop(self):
+        """Remove the last fraction from the array, if there is one."""
+        if self._fractions is not None:
+            try:
+                self._fractions.pop()
+            except BufferError:
+                # array is in use, e.g. by a NumPy view; rebuild it later
+                self._fractions = None
+
+    def _set_item_values(self, item, label, value):
+        """Also use the value of the row as the fraction of the item.
+
+        In value mode, the fraction is set from the values instead.
+        """
+        super(PieChart, self)._set_item_values(item, label, value)
+        if not self._value_mode:
+            item.fraction = value or 0
+
+    def setChartFractions(self, fractions, labels=None):
+        """Set the items of the chart from a sequence of fractions.
+
+        A new item (of the chart's item class) is created for each
+        fraction.  The fractions are checked all at once (vectorised, if
+        NumPy is available), so this is much faster than
+        ``setChartItems`` for large charts.  The checks and errors are
+        the same.
+
+        fractions
+          Sequence or NumPy array of the fractions of the items.
+        labels
+          Sequence of the labels of the items (optional), of the same
+          length.
+
+        Raise ``RuntimeError`` in value mode.
+        """
+        self._check_fraction_mode()
+        if labels is None:
+            labels = itertools.repeat(None)
+        elif len(labels) != len(fractions):
+            raise ValueError('There must be one label for each fraction.')
+        if numpy is None:
+            self.setChartItems([
+                self._item_class(fraction=fraction, label=label)
+                for fraction, label in itertools.izip(fractions, labels)
+            ])
+            return
+
+        try:
+            column = numpy.asarray(fractions, dtype=float)
+        except (TypeError, ValueError):
+            raise TypeError('PieChartItem fraction must be a Number.')
+        if column.ndim != 1:
+            raise ValueError('Fractions must be one-dimensional.')
+        if len(column) and column.min() < 0:
+            raise ValueError('PieChartItem fraction cannot be less than 0.')
+        if len(column) and column.max() > 1:
+            raise ValueError('PieChartItem fraction cannot be greater than 1.')
+        column = column.tolist()
+        self._check_sum(column)
+        self._items = [
+            self._item_class(fraction=fraction, label=label)
+            for fraction, label in itertools.izip(column, labels)
+        ]
+        self._index = {}
+        self._reindex()
+        self._items_changed()
+
+    def chartFractions(self):
+        """Return the fractions of the items, as an ``array('d')``.
+
+        The array must not be modified.
+        """
+        if self._fractions is None:
+            self._fractions = \
+                array.array('d', (item.fraction for item in self._items))
+        return self._fractions
+
+    def setDetailThreshold(self, pixels):
+        """Set the level-of-detail threshold, in pixels.
+
+        If non-zero, runs of slices whose arcs are each shorter than this
+        are painted as a single grey wedge.  The items are unaffected.
+        Defaults to ``0`` (every slice is painted).
+        """
+        self._detail_threshold = pixels
+        self._items_changed()
+
+    def detailThreshold(self):
+        """Return the level-of-detail threshold, in pixels."""
+        return self._detail_threshold
+
+    def setCacheEnabled(self, enabled):
+        """Set whether the painted slices are cached in a ``QPixmap``.
+
+        When enabled, repaints that are not due to a change in the items
+        or the size of the chart just draw the cached pixmap.  Disabled
+        by default.
+        """
+        self._cache_enabled = enabled
+        if not enabled:
+            self._cache = self._cache_key = None
+        self.update()
+
+    def isCacheEnabled(self):
+        """Return whether the painted slices are cached."""
+        return self._cache_enabled
+
+    def setAnimationDuration(self, msecs):
+        """Set the duration of animated transitions, in milliseconds.
+
+        If non-zero, when the items change the slices move smoothly from
+        their old spans to their new spans, rather than jumping.  If the
+        items change during a transition, a new transition starts from
+        the spans currently shown.  All charts are animated by a single
+        shared timer; see ``animation.Animator``.  Defaults to ``0`` (no
+        animation).
+        """
+        self._animation_duration = msecs
+        if not msecs:
+            self._shown = None
+            self._stop_animation()
+
+    def animationDuration(self):
+        """Return the duration of animated transitions, in milliseconds."""
+        return self._animation_duration
+
+    def _start_animation(self):
+        """Start a transition from the fractions shown to the items."""
+        self._animation = None
+        if self._shown is None or not self.isVisible():
+            return
+        items, fractions = self._shown
+        shown = dict(itertools.izip((id(item) for item in items), fractions))
+        start = [shown.get(id(item), 0) for item in self._items]
+        end = list(self.chartFractions())
+        if start == end:
+            return
+        if numpy is not None:
+            start, end = numpy.array(start), numpy.array(end)
+        animator = animation.animator()
+        self._animation = start, end, animator.elapsed()
+        self._animated_fractions = start
+        animator.addAnimation(self._animation_frame)
+
+    def _stop_animation(self):
+        """Jump to the end of the transition, if there is one."""
+        animation.animator().removeAnimation(self._animation_frame)
+        if self._animation is not None:
+            self._animation = self._animated_fractions = None
+            self._pie_layout = None
+            self._version += 1
+            self.update()
+
+    def _animation_frame(self, now):
+        """Show the transition at time ``now``.
 
-    def removeChartItem(self, *args, **kwargs):
-        super(PieChart, self).removeChartItems(*args, **kwargs)
-        self._set_colours()
+        Return whether the transition is still running.
+        """
+        if self._animation is None:
+            return False
+        start, end, start_time = self._animation
+        t = (now - start_time) / self._animation_duration
+        if t >= 1:
+            self._animation = self._animated_fractions = None
+        else:
+            t = t * t * (3 - 2 * t)  # ease in and out
+            if _is_array(start):
+                self._animated_fractions = start + (end - start) * t
+            else:
+                self._animated_fractions = [
+                    a + (b - a) * t for a, b in itertools.izip(start, end)
+                ]
+        self._pie_layout = None
+        self._version += 1
+        self.update()
+        return self._animation is not None
+
+    def itemAt(self, pos):
+        """Return the ``PieChartItem`` at ``pos`` (a ``QPoint``).
+
+        Return ``None`` if there is no item at that point.
+        """
+        index = self._index_at(pos.x(), pos.y())
+        return None if index is None else self._items[index]
+
+    def _index_at(self, x, y):
+        """Return the index of the item at (x, y), or ``None``."""
+        layout = self._layout()
+        radius, angle = polar(x, y, layout.origin)
+        if radius > layout.radius:
+            return None
+        return layout.slice_at(angle)
+
+    def setHoverEnabled(self, enabled):
+        """Set whether the item under the mouse is highlighted.
+
+        Enabling this enables mouse tracking.  Disabled by default.
+        """
+        self._hover_enabled = enabled
+        self.setMouseTracking(enabled)
+        if not enabled:
+            self._set_hovered(None)
+
+    def isHoverEnabled(self):
+        """Return whether the item under the mouse is highlighted."""
+        return self._hover_enabled
+
+    def setToolTipsEnabled(self, enabled):
+        """Set whether a tool tip is shown for the item under the mouse.
+
+        The tool tip shows the label and the value of the item (or its
+        fraction, if it has no value); see ``_tool_tip``.  Disabled by
+        default.
+        """
+        self._tool_tips_enabled = enabled
+
+    def isToolTipsEnabled(self):
+        """Return whether tool tips are shown for the items."""
+        return self._tool_tips_enabled
+
+    def _tool_tip(self, item):
+        """Return the tool tip text for the item."""
+        value = unicode(item.value) if item.value is not None \
+            else u'{:.1%}'.format(item.fraction)
+        if item.label is None:
+            return value
+        return u'{}: {}'.format(unicode(item.label), value)
+
+    def _set_hovered(self, index):
+        """Highlight the item at ``index`` (``None`` for no item).
+
+        Only the wedges of the previously and newly highlighted items
+        are repainted.
+        """
+        if index == self._hovered:
+            return
+        layout = self._layout()
+        region = QRegion()
+        for i in self._hovered, index:
+            if i is not None:
+                region = region.united(
+                    layout.wedge_rect(layout.starts[i], layout.spans[i]))
+        self._hovered = index
+        self.update(region)
+
+    def event(self, ev):
+        if ev.type() == QEvent.ToolTip and self._tool_tips_enabled:
+            item = self.itemAt(ev.pos())
+            if item is None:
+                QToolTip.hideText()
+                ev.ignore()
+            else:
+                QToolTip.showText(ev.globalPos(), self._tool_tip(item), self)
+            return True
+        return super(PieChart, self).event(ev)
+
+    def mouseMoveEvent(self, ev):
+        if self._hover_enabled:
+            self._set_hovered(self._index_at(ev.x(), ev.y()))
+        super(PieChart, self).mouseMoveEvent(ev)
+
+    def leaveEvent(self, ev):
+        self._set_hovered(None)
+        super(PieChart, self).leaveEvent(ev)
+
+    def _invalidate(self, region=None):
+        """Recolour, and discard the layout and (in ``region``) the cache.
+
+        If ``region`` is given, the caller must already have updated the
+        layout, and the items are not recoloured.
+        """
+        if region is None:
+            if self._value_mode:
+                self._normalise_values()
+                self._fractions_updated = False
+            self._pie_layout = None
+            self._hovered = None
+            if not self._fractions_updated:
+                self._fractions = self._tree = None
+            self._fractions_updated = False
+            if self._stats is not None:
+                start = self._clock()
+                self._set_colours()
+                self._record_time('set_colours', start)
+            else:
+                self._set_colours()
+            if self._animation_duration:
+                self._start_animation()
+        elif self._cache_key == (self.width(), self.height(), self._version):
+            # cached pixmap remains valid outside the region
+            self._cache_dirty = self._cache_dirty.united(region)
+            self._cache_key = self.width(), self.height(), self._version + 1
+
+    def resizeEvent(self, ev):
+        self._pie_layout = None
+        super(PieChart, self).resizeEvent(ev)
+
+    def _make_layout(self):
+        """Compute a new ``PieLayout`` for the current items and size.
+
+        During a transition, the layout is of the fractions shown.
+        """
+        if self._animation is not None:
+            fractions = self._animated_fractions
+        else:
+            fractions = self.chartFractions()
+            if numpy is not None:
+                # view of the fractions, without copying
+                fractions = numpy.frombuffer(fractions, dtype=float) \
+                    if fractions else numpy.zeros(0)
+        if self._animation_duration:
+            self._shown = list(self._items), \
+                fractions.tolist() if _is_array(fractions) else list(fractions)
+        return PieLayout(fractions, self.origin, self._layout_radius())
+
+    def _layout_radius(self):
+        """Return the radius of the slices of the layout."""
+        return self.radius
+
+    def _layout(self):
+        """Return the ``PieLayout``, computing it if necessary."""
+        if self._pie_layout is None:
+            self._pie_layout = self._make_layout()
+        return self._pie_layout
 
     def _square(self):
         """Return a centered, square QRect of the maximum size possible."""
-        return QRect(
-            self.width() / 2 - self.radius,
-            self.height() / 2 - self.radius,
-            self.radius * 2,
-            self.radius * 2
-        )
+        return self._layout().rect
 
     def _colours(self):
         """A generator of ``QColor`` objects for the pie chart.
 
-        One colour will be generated for each slice.  In the HSV colour
-        space, the colours will be evenly spaced around the cylinder
-        (i.e., the hues will be as distinct as possible), with set
-        saturation and value.
+        One colour will be generated for each slice; see ``colours``.
+        """
+        return colours(len(self._items), self._colour_scheme)
+
+    def setColourScheme(self, scheme):
+        """Set the name of the colour scheme; see ``palette``.
+
+        Defaults to ``'hsv'``.
+        """
+        palette.colour_table(0, scheme)  # check the scheme exists
+        self._colour_scheme = scheme
+        self._items_changed()
+
+    def colourScheme(self):
+        """Return the name of the colour scheme."""
+        return self._colour_scheme
+
+    def setStableColours(self, enabled, scheme='golden'):
+        """Set whether items keep their colours when others are added.
+
+        By default, the colours of all items are reassigned whenever the
+        items change, so that they are as distinct as possible.  With
+        stable colours, each item added to the chart keeps the colour it
+        is given for as long as it is in the chart.  New items take the
+        first colours of the colour scheme ``scheme`` not used by other
+        items, so the colours of removed items are reused; the colours
+        of the scheme must not depend on the number of items.  Items
+        keep their current colours when this is enabled.
         """
-        hue_delta = 360 / len(self._items)
-        hue = 0
-        for i in xrange(len(self._items)):
-            yield QColor.fromHsv(int(math.floor(hue)), 191, 255)
-            hue += hue_delta
+        self._stable_scheme = scheme if enabled else None
+        if enabled:
+            self._colour_indices = dict(
+                (id(item), i) for i, item in enumerate(self._items))
+        else:
+            self._colour_indices = None
+            self._items_changed()
+
+    def stableColours(self):
+        """Return whether stable colours are enabled."""
+        return self._stable_scheme is not None
 
     def _set_colours(self):
         """Set the colours of all items in the cart."""
+        if self._stable_scheme is not None:
+            old = self._colour_indices
+            indices = {}
+            new = []
+            for item in self._items:
+                index = old.get(id(item))
+                if index is None or item.colour is _DEFAULT_COLOUR:
+                    new.append(item)
+                else:
+                    indices[id(item)] = index
+            if new:
+                used = set(indices.values())
+                free = (i for i in itertools.count() if i not in used)
+                for item, index in itertools.izip(new, free):
+                    item.colour = palette.colour(index, self._stable_scheme)
+                    indices[id(item)] = index
+            self._colour_indices = indices
+            return
         for item, colour in itertools.izip(self._items, self._colours()):
             item.colour = colour  # set the current colour
 
+    def _cached_slices(self):
+        """Return a ``QPixmap`` of the slices, painting it if necessary."""
+        key = self.width(), self.height(), self._version
+        if self._stats is not None:
+            self._stats.count(
+                'cache_miss' if key != self._cache_key
+                else 'cache_hit' if self._cache_dirty.isEmpty()
+                else 'cache_partial'
+            )
+        if key != self._cache_key:
+            self._cache = QPixmap(self.size())
+            self._cache.fill(Qt.transparent)
+            p = QPainter(self._cache)
+            self._paint_slices(p)
+            p.end()
+            self._cache_key = key
+            self._cache_dirty = QRegion()
+        elif not self._cache_dirty.isEmpty():
+            p = QPainter(self._cache)
+            p.setClipRegion(self._cache_dirty)
+            p.setCompositionMode(QPainter.CompositionMode_Source)
+            p.fillRect(self._cache_dirty.boundingRect(), Qt.transparent)
+            p.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            self._paint_slices(p, self._cache_dirty)
+            p.end()
+            self._cache_dirty = QRegion()
+        return self._cache
+
+    def _clip_region(self, ev):
+        """Return the region to be painted for the paint event.
+
+        Return ``None`` if the whole widget is to be painted.
+        """
+        region = ev.region()
+        if QRegion(self.rect()).subtracted(region).isEmpty():
+            return None
+        return region
+
     def paintEvent(self, ev):
         """Paint the pie chart."""
+        timed = self._animation is not None or self._stats is not None
+        if timed:
+            start = self._clock()
         p = QPainter(self)
+        if self._cache_enabled:
+            rect = ev.rect()
+            p.drawPixmap(rect, self._cached_slices(), rect)
+        else:
+            self._paint_slices(p, self._clip_region(ev))
+        if self._hovered is not None:
+            self._paint_hovered(p)
+        if timed:
+            msecs = (self._clock() - start) * 1000
+            if self._animation is not None:
+                animation.animator().addPaintTime(msecs)
+            if self._stats is not None:
+                self._record('paint', msecs)
+
+    def _paint_slices(self, p, region=None):
+        """Paint the slices with the given ``QPainter``.
+
+        region
+          If given, slices outside this ``QRegion`` are skipped.
+        """
+        paint_slices(
+            p,
+            self._layout(),
+            _ItemColours(self._items),
+            region,
+            self._detail_threshold
+        )
+
+    def _paint_hovered(self, p):
+        """Paint the highlighted item with the given ``QPainter``."""
+        layout = self._layout()
+        span = layout.spans[self._hovered]
+        if span <= 0:
+            return
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
         pen = QPen()
         pen.setWidth(2)
         p.setPen(pen)
-        rect = self._square()
-
-        angle = 0
-        for item in self._items:
-            if item.fraction > 0:
-                p.setBrush(QBrush(item.colour))
-                span = fraction_to_angle(item.fraction)
-                p.drawPie(rect, angle, span)
-                angle += span
+        p.setBrush(QBrush(self._items[self._hovered].colour.lighter(130)))
+        p.drawPie(layout.rect, layout.starts[self._hovered], span)
 
 
 class AdjustablePieChart(PieChart):
@@ -214,6 +1045,13 @@ class AdjustablePieChart(PieChart):
     """
     itemAdjusted = Signal(PieChartItem)
 
+    """Signal emitted with the list of ``PieChartItem``s adjusted.
+
+    Emitted once per mouse movement, or, if an adjustment interval is
+    set, at most once per interval.
+    """
+    itemsAdjusted = Signal(list)
+
     """Signal emitted when adjustment has finished."""
     finishedAdjusting = Signal()
 
@@ -236,17 +1074,99 @@ class AdjustablePieChart(PieChart):
         super(AdjustablePieChart, self).__init__(**kwargs)
         self._gripped = []  # currently-active grips
         self._maintain_total = maintain_total
+        self._adjusted = []  # items adjusted since signals last emitted
+        self._adjusted_ids = set()
+        self._adjustment_interval = None
+        self._adjustment_timer = QTimer(self)
+        self._adjustment_timer.setSingleShot(True)
+        self._adjustment_timer.timeout.connect(self._flush_adjusted)
+        self._move_rate = None
+        self._pending_move = None  # latest pointer position not yet applied
+        self._move_clock = QElapsedTimer()  # time since last move applied
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.timeout.connect(self._apply_pending_move)
+        self._drag_events = 0  # mouse moves in this drag, for statistics
+
+    def setMaximumMoveRate(self, rate):
+        """Set the maximum rate at which mouse movements are applied.
+
+        If ``rate`` is ``None`` (the default), each mouse movement
+        adjusts the gripped slice as it arrives.
+
+        Otherwise only the latest pointer position is recorded, and
+        adjustments are applied from a timer at most ``rate`` times per
+        second (with a rate of ``0``, once per iteration of the event
+        loop).  Any pending position is applied when the mouse button is
+        released, so the final state and signals are unaffected.
+        """
+        self._move_rate = rate
+        if rate is None:
+            self._apply_pending_move()
+
+    def maximumMoveRate(self):
+        """Return the maximum rate at which mouse movements are applied."""
+        return self._move_rate
+
+    def setAdjustmentInterval(self, msecs):
+        """Set the interval for coalescing adjustment signals.
+
+        If ``msecs`` is ``None`` (the default), ``itemAdjusted`` is
+        emitted as soon as an item is adjusted, and ``itemsAdjusted``
+        once per mouse movement.
+
+        Otherwise adjusted items are collected and the signals emitted
+        at most once every ``msecs`` milliseconds: ``itemAdjusted`` once
+        for each item adjusted in that time, then ``itemsAdjusted``.
+        With an interval of ``0``, signals are emitted once per
+        iteration of the event loop.  Pending signals are always emitted
+        before ``finishedAdjusting``.
+        """
+        self._adjustment_interval = msecs
+        if msecs is None:
+            self._flush_adjusted()
+        else:
+            self._adjustment_timer.setInterval(msecs)
+
+    def adjustmentInterval(self):
+        """Return the interval for coalescing adjustment signals."""
+        return self._adjustment_interval
+
+    def _item_adjusted(self, item):
+        """Record that the item was adjusted, emitting signals if due."""
+        if self._adjustment_interval is None:
+            self.itemAdjusted.emit(item)
+            if self._stats is not None:
+                self._stats.count('signals')
+        if id(item) not in self._adjusted_ids:
+            self._adjusted_ids.add(id(item))
+            self._adjusted.append(item)
+        if self._adjustment_interval is not None \
+                and not self._adjustment_timer.isActive():
+            self._adjustment_timer.start()
+
+    def _flush_adjusted(self):
+        """Emit signals for the items adjusted since the last flush."""
+        self._adjustment_timer.stop()
+        if not self._adjusted:
+            return
+        items = self._adjusted
+        self._adjusted = []
+        self._adjusted_ids = set()
+        if self._adjustment_interval is not None:
+            for item in items:
+                self.itemAdjusted.emit(item)
+        self.itemsAdjusted.emit(items)
+        if self._stats is not None:
+            self._stats.count('signals', 1 + (
+                len(items) if self._adjustment_interval is not None else 0))
 
     def _polar(self, x, y):
         """Convert cartisian coordinates to polar coordinates.
 
         Return (radius, angle) (angle in Qt terms).
         """
-        rel_x = x - self.x
-        rel_y = self.y - y
-        theta = math.atan2(rel_y, rel_x)
-        theta = theta if theta >= 0 else theta + math.pi * 2
-        return self.radius, theta_to_angle(theta)
+        return polar(x, y, self.origin)
 
     def _cartesian(self, angle):
         """Returns cartesian coordinates of point on graph at given angle.
@@ -256,51 +1176,204 @@ class AdjustablePieChart(PieChart):
         angle
           The angle, in Qt terms.
         """
-        theta = angle_to_theta(angle)
-        x, y = self.radius * math.cos(theta), self.radius * math.sin(theta)
-        return self.x + x, self.y - y
+        return self._layout().cartesian(angle)
+
+    def _make_layout(self):
+        layout = super(AdjustablePieChart, self)._make_layout()
+        n = len(self._items)
+        # omit last grip if we need to maintain the total fraction
+        stop = max(n - 1 if self._maintain_total else n, 0)
+        angles, xs, ys = boundary_points(
+            layout.starts[:stop],
+            layout.spans[:stop],
+            layout.origin,
+            layout.radius
+        )
+        if _is_array(angles):
+            angles, xs, ys = angles.tolist(), xs.tolist(), ys.tolist()
+        layout.grips = zip(xs, ys, angles, self._items[:stop])
+        layout.grip_angles = angles
+        return layout
+
+    def _update_slices(self, start, stop):
+        """Also move the grips at the ends of the slices that moved."""
+        region = super(AdjustablePieChart, self)._update_slices(start, stop)
+        layout = self._layout()
+        if start < len(layout.grips):
+            angles, xs, ys = boundary_points(
+                layout.starts[start:len(layout.grips)],
+                layout.spans[start:len(layout.grips)],
+                layout.origin,
+                layout.radius
+            )
+            if _is_array(angles):
+                angles, xs, ys = angles.tolist(), xs.tolist(), ys.tolist()
+            layout.grips[start:] = zip(
+                xs, ys, angles, self._items[start:len(layout.grips)])
+            layout.grip_angles[start:] = angles
+            # the grips overlap the edge of the wedge
+            m = self._grip_radius + PieLayout.margin
+            region = QRegion(region.boundingRect().adjusted(-m, -m, m, m))
+        return region
 
     def _grips(self):
-        """A generator for the cartesian coordinates of all grips.
+        """Return the cartesian coordinates of all grips.
 
-        Return ``x, y, angle, item`` where ``angle`` is the angle of the
-        grip and ``item`` is the items whose grip should be found at the
-        given coordinates.
+        Return a list of ``x, y, angle, item`` where ``angle`` is the
+        angle of the grip and ``item`` is the items whose grip should be
+        found at the given coordinates.
         """
-        angle = 0
-        n = len(self._items)
-        # omit last grip if we need to maintain the total fraction
-        stop = n - 1 if self._maintain_total else n
-        for item in self._items[:stop]:
-            angle += fraction_to_angle(item.fraction)
-            yield self._cartesian(angle) + (angle, item)
+        return self._layout().grips
 
     def paintEvent(self, ev):
         super(AdjustablePieChart, self).paintEvent(ev)
+        if self._value_mode:
+            return  # slices cannot be dragged
 
+        if self._stats is not None:
+            start = self._clock()
         p = QPainter(self)
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
         pen = QPen()
         pen.setWidth(2)
         p.setPen(pen)
         p.setBrush(Qt.GlobalColor.white)
-        angle = 0
+        region = self._clip_region(ev)
         for x, y, angle, item in self._grips():
+            if region is not None \
+                    and not region.intersects(self._grip_rect(x, y)):
+                continue
             p.drawEllipse(QPointF(x, y), self._grip_radius, self._grip_radius)
+        if self._stats is not None:
+            p.end()
+            self._record_time('paint_grips', start)
 
-    def mousePressEvent(self, ev):
-        """Record the active grips."""
-        self._gripped = [
-            (x, y, angle, item)
-            for x, y, angle, item in self._grips()
-            if math.sqrt((x - ev.x()) ** 2 + (y - ev.y()) ** 2)
+    def _grip_rect(self, x, y):
+        """Return the bounding ``QRect`` of the grip at (x, y)."""
+        r = self._grip_radius + PieLayout.margin
+        return QRect(int(x - r), int(y - r), int(2 * r) + 2, int(2 * r) + 2)
+
+    def _move_boundary(self, index):
+        """Update the layout after adjusting the item at ``index``.
+
+        The fractions of the item at ``index`` and the following item
+        (if there is one) have changed.  Update their spans and the grip
+        between them, and return the ``QRegion`` that needs repainting.
+        """
+        for i in index, index + 1:
+            if i < len(self._items):
+                if self._fractions is not None:
+                    self._fractions[i] = self._items[i].fraction
+                if self._tree is not None:
+                    self._tree[i] = self._items[i].fraction
+                if self._shown is not None:
+                    self._shown[1][i] = self._items[i].fraction
+
+        layout = self._layout()
+        layout._wedges.clear()  # spans are changing
+        start = layout.starts[index]
+        old_end = start + layout.spans[index]
+        layout.spans[index] = fraction_to_angle(self._items[index].fraction)
+        new_end = start + layout.spans[index]
+        end_angle = max(old_end, new_end)
+        if index + 1 < len(self._items):
+            layout.starts[index + 1] = new_end
+            layout.spans[index + 1] = \
+                fraction_to_angle(self._items[index + 1].fraction)
+            end_angle = max(end_angle, new_end + layout.spans[index + 1])
+
+        region = QRegion(layout.wedge_rect(start, end_angle - start))
+        if index < len(layout.grips):
+            old_x, old_y = layout.grips[index][:2]
+            x, y = layout.cartesian(new_end)
+            layout.grips[index] = x, y, new_end, self._items[index]
+            layout.grip_angles[index] = new_end
+            region = region.united(self._grip_rect(old_x, old_y))
+            region = region.united(self._grip_rect(x, y))
+        return region
+
+    def _grips_at(self, x, y):
+        """Return the grips at the given point, in order.
+
+        Only the grips whose angles are close to the angle of the point
+        are tested, so this is logarithmic in the number of grips.
+        """
+        layout = self._layout()
+        grips = layout.grips
+        radius, angle = self._polar(x, y)
+
+        # all grips lie on the circumference
+        if abs(radius - layout.radius) >= self._grip_radius:
+            return []
+
+        if layout.radius > self._grip_radius:
+            # the angle subtended by a grip, as seen from the origin
+            delta = theta_to_angle(
+                math.asin(self._grip_radius / layout.radius)
+            )
+            # test the neighbouring revolutions too, for grips near the
+            # 0 / 360 degree boundary
+            indices = set()
+            for offset in 0, fraction_to_angle(1), -fraction_to_angle(1):
+                indices.update(xrange(
+                    bisect.bisect_left(
+                        layout.grip_angles, angle + offset - delta),
+                    bisect.bisect_right(
+                        layout.grip_angles, angle + offset + delta)
+                ))
+            candidates = [grips[i] for i in sorted(indices)]
+        else:
+            candidates = grips
+        return [
+            grip for grip in candidates
+            if math.sqrt((grip[0] - x) ** 2 + (grip[1] - y) ** 2)
                 < self._grip_radius
         ]
 
+    def mousePressEvent(self, ev):
+        """Record the active grips."""
+        self._stop_animation()  # grips are of the final layout
+        self._move_timer.stop()
+        self._pending_move = None
+        self._gripped = []
+        if not self._value_mode:
+            self._gripped = self._grips_at(ev.x(), ev.y())
+        self._drag_events = 0
+
     def mouseMoveEvent(self, ev):
+        if not self._gripped:
+            super(AdjustablePieChart, self).mouseMoveEvent(ev)
+            return
+        if self._stats is not None:
+            self._drag_events += 1
+        if self._move_rate is None:
+            self._adjust(ev.x(), ev.y())
+            return
+
+        self._pending_move = ev.x(), ev.y()
+        if not self._move_timer.isActive():
+            interval = 0
+            if self._move_rate > 0 and self._move_clock.isValid():
+                interval = max(
+                    int(1000 / self._move_rate) - self._move_clock.elapsed(),
+                    0
+                )
+            self._move_timer.start(interval)
+
+    def _apply_pending_move(self):
+        """Apply the latest recorded pointer position, if any."""
+        self._move_timer.stop()
+        if self._pending_move is not None:
+            x, y = self._pending_move
+            self._pending_move = None
+            self._move_clock.start()
+            self._adjust(x, y)
+
+    def _adjust(self, x, y):
+        """Adjust the gripped slice for the pointer at (x, y)."""
         if self._gripped:
             # calculate current angle of pointer
-            radius, angle = self._polar(ev.x(), ev.y())
+            radius, angle = self._polar(x, y)
 
             # if there are multiple grips (in same spot), use first item
             # if the angle has decreased wrt the grip angle, otherwise
@@ -315,51 +1388,50 @@ class AdjustablePieChart(PieChart):
                 self._gripped = [self._gripped[-1]]
 
             gripped_item = self._gripped[0][3]
-            index = self._items.index(gripped_item)
-            previous_items = self._items[:index]
-            next_items = self._items[index + 1:]
+            index = self.chartItemIndex(gripped_item)
+            next_items = self._items[index + 1:index + 2]
 
             # calculate some interesting angles for this item
             #
             # A slice cannot become smaller than its base_angle and
             # cannot become larger than its max_angle
-            base_angle = fraction_to_angle(
-                sum(item.fraction for item in previous_items)
-            )
-            cur_angle = base_angle + fraction_to_angle(gripped_item.fraction)
-            max_angle = cur_angle + fraction_to_angle(next_items[0].fraction) \
+            layout = self._layout()
+            base_angle = layout.starts[index]
+            cur_angle = base_angle + layout.spans[index]
+            max_angle = cur_angle + layout.spans[index + 1] \
                 if next_items else fraction_to_angle(1)
 
             # determine whether we have grown to max or shrunk to base
             # if the angle is not between base and max
-            if not base_angle <= angle <= max_angle:
-                midline = opposite_angle((max_angle + base_angle) / 2)
-                if midline < 180 * 16 and 0 <= angle < midline:
-                    angle = max_angle
-                elif midline >= 180 * 16 and midline <= angle <= 360 * 16:
-                    angle = base_angle
-                elif angle < base_angle:
-                    angle = base_angle
-                else:
-                    angle = max_angle
+            angle = clamp_angle(angle, base_angle, max_angle)
 
             if angle != cur_angle:  # angle has changed
+                if self._stats is not None:
+                    self._stats.count('adjustments')
                 # set the fraction of the gripped_item
                 gripped_item.fraction = \
                     max(angle_to_fraction(angle - base_angle), 0)
-                self.itemAdjusted.emit(gripped_item)
+                self._item_adjusted(gripped_item)
 
                 # subtract new angle from next item (if there is one)
                 if next_items:
                     fraction_delta = angle_to_fraction(angle - cur_angle)
                     next_items[0].fraction = \
                         max(next_items[0].fraction - fraction_delta, 0)
-                    self.itemAdjusted.emit(next_items[0])
+                    self._item_adjusted(next_items[0])
 
-            self.update()
+                self._items_changed(self._move_boundary(index))
+
+                if self._adjustment_interval is None:
+                    self._flush_adjusted()
 
     def mouseReleaseEvent(self, ev):
         if self._gripped:
             # something was gripped, but now is not; emit finishedAdjusting
+            self._apply_pending_move()
+            self._flush_adjusted()
             self.finishedAdjusting.emit()
+            if self._stats is not None:
+                self._stats.count('signals')
+                self._record('drag_events', self._drag_events)
         self._gripped = []
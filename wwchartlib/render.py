@@ -0,0 +1,386 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Render charts without widgets.
+
+The charts are painted directly onto a ``QImage`` or ``QSvgGenerator``,
+so no window is shown and no display is needed.  A ``QApplication``
+must still exist, but a non-GUI one, i.e. ``QApplication([], False)``,
+is enough.
+
+The module can also be run as a script to render a stream of chart
+specifications to files, in parallel; see ``main``.
+"""
+
+from __future__ import division
+
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+from PySide.QtCore import *
+from PySide.QtGui import *
+from PySide.QtSvg import *
+
+from . import piechart
+
+
+def _size(size):
+    """Convert ``size`` (a ``QSize`` or tuple (w, h)) to a ``QSize``."""
+    return size if isinstance(size, QSize) else QSize(*size)
+
+
+def paint_pie_chart(p, items, size):
+    """Paint a pie chart of the given ``PieChartItem``s.
+
+    The chart is painted with the ``QPainter`` as it would be by a
+    ``PieChart`` of the given size, with the colours a ``PieChart``
+    would assign.  Raise an exception if the items are not valid.
+    """
+    items = [piechart.PieChart._check_item(item) for item in items]
+    piechart.PieChart._check_items(items)
+    size = _size(size)
+    origin = size.width() / 2, size.height() / 2
+    layout = piechart.PieLayout(
+        (item.fraction for item in items),
+        origin,
+        min(origin) - piechart.PieChart._padding
+    )
+    piechart.paint_slices(p, layout, list(piechart.colours(len(items))))
+
+
+def render_to_image(items, size, background=Qt.transparent):
+    """Render a pie chart of the ``PieChartItem``s to a ``QImage``.
+
+    size
+      The size of the image, as ``QSize`` or tuple (w, h).
+    background
+      The colour of the background.  Defaults to transparent.
+    """
+    image = QImage(_size(size), QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor(background).rgba())
+    p = QPainter(image)
+    paint_pie_chart(p, items, size)
+    p.end()
+    return image
+
+
+def render_to_svg(items, size, filename=None):
+    """Render a pie chart of the ``PieChartItem``s as SVG.
+
+    If ``filename`` is given, write the SVG to that file, otherwise
+    return it as a string.
+    """
+    size = _size(size)
+    generator = QSvgGenerator()
+    generator.setSize(size)
+    generator.setViewBox(QRect(QPoint(0, 0), size))
+    if filename is None:
+        buf = QBuffer()
+        buf.open(QIODevice.WriteOnly)
+        generator.setOutputDevice(buf)
+    else:
+        generator.setFileName(filename)
+    p = QPainter(generator)
+    paint_pie_chart(p, items, size)
+    p.end()
+    if filename is None:
+        return str(buf.data())
+
+
+def render_to_bytes(items, size, format='PNG'):
+    """Render a pie chart of the ``PieChartItem``s to a string.
+
+    format
+      ``'SVG'`` or any image format supported by ``QImage``, e.g.
+      ``'PNG'`` (the default) or ``'JPG'``.
+    """
+    if format.upper() == 'SVG':
+        return render_to_svg(items, size)
+    background = Qt.white if format.upper() in ('JPG', 'JPEG', 'BMP') \
+        else Qt.transparent
+    image = render_to_image(items, size, background)
+    buf = QBuffer()
+    buf.open(QIODevice.WriteOnly)
+    if not image.save(buf, format):
+        raise ValueError('Cannot write image format {}.'.format(format))
+    return str(buf.data())
+
+
+def spec_key(spec):
+    """Return the cache key of a chart specification.
+
+    The key is a hash of everything that affects the rendered output,
+    so identical charts have the same key regardless of their labels
+    or output path.
+    """
+    content = json.dumps(
+        [spec['fractions'], list(spec['size']), spec_format(spec)],
+        separators=(',', ':')
+    )
+    return hashlib.sha1(content).hexdigest()
+
+
+def spec_format(spec):
+    """Return the output format of a chart specification, in upper case.
+
+    The format is taken from the ``format`` key if present, otherwise
+    from the extension of the output filename, otherwise ``PNG``.
+    """
+    if 'format' in spec:
+        return spec['format'].upper()
+    ext = os.path.splitext(spec.get('output', ''))[1]
+    return ext[1:].upper() if ext else 'PNG'
+
+
+def render_spec(spec):
+    """Render a chart specification, returning the output as a string.
+
+    A specification is a ``dict`` with the keys:
+
+    ``fractions``
+      List of the fractions of the slices.
+    ``labels``
+      List of labels of the slices (optional).
+    ``size``
+      The size of the chart, as list [w, h].
+    ``format``
+      The output format (optional; see ``spec_format``).
+    ``output``
+      The filename to write the chart to (used by ``render_specs``).
+    """
+    labels = spec.get('labels') or [None] * len(spec['fractions'])
+    items = [
+        piechart.PieChartItem(fraction=fraction, label=label)
+        for fraction, label in zip(spec['fractions'], labels)
+    ]
+    return render_to_bytes(items, tuple(spec['size']), spec_format(spec))
+
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key)
+
+
+_app = None  # QApplication of a worker process
+
+
+def _init_worker():
+    """Create the ``QApplication`` of a worker process."""
+    global _app
+    _app = QApplication.instance() or QApplication([], False)
+
+
+def _error_message(e):
+    """Return the message reported for the exception ``e``."""
+    return '{}: {}'.format(type(e).__name__, e)
+
+
+def _render_to_cache(args):
+    """Render a chart specification into the cache.
+
+    Return ``(key, error)``; ``error`` is ``None`` on success.
+    """
+    spec, key, cache_dir = args
+    try:
+        data = render_spec(spec)
+    except Exception as e:
+        return key, _error_message(e)
+    path = _cache_path(cache_dir, key)
+    try:
+        os.makedirs(os.path.dirname(path))
+    except OSError:
+        pass  # already exists
+    # write a temporary file, then rename, so that the cache never
+    # contains partial output
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(tmp, path)
+    except (IOError, OSError) as e:
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+        return key, _error_message(e)
+    return key, None
+
+
+def _new_charts(specs, cache_dir, outputs, cached, errors):
+    """Yield the arguments of ``_render_to_cache`` for each new chart.
+
+    Charts already seen or in the cache are skipped.  The output
+    filenames of the specifications are added to ``outputs`` (key ->
+    list of filenames) and the keys of charts found in the cache to the
+    set ``cached``, as the specifications are read.  Specifications
+    that are not valid are skipped and added to the list ``errors`` as
+    ``(output, error)``; the output is the position of the
+    specification if it has no output filename.
+    """
+    for i, spec in enumerate(specs):
+        try:
+            key = spec_key(spec)
+        except Exception as e:
+            output = spec.get('output') if isinstance(spec, dict) else None
+            errors.append((
+                output or 'specification {}'.format(i + 1),
+                _error_message(e)
+            ))
+            continue
+        if key not in outputs:
+            outputs[key] = []
+            if os.path.exists(_cache_path(cache_dir, key)):
+                cached.add(key)
+            else:
+                yield spec, key, cache_dir
+        if spec.get('output'):
+            outputs[key].append(spec['output'])
+
+
+def render_specs(specs, cache_dir=None, processes=None, chunksize=16):
+    """Render chart specifications to their output files.
+
+    Each distinct chart is rendered once, by a pool of ``processes``
+    worker processes (defaults to the number of CPUs), into a cache
+    directory keyed by ``spec_key``.  Charts already in the cache are
+    not rendered again.  The specifications are rendered as they are
+    read, so ``specs`` may be a lazy iterable of any length.  The
+    rendered charts are then copied to the outputs of the
+    specifications.
+
+    specs
+      Iterable of chart specifications; see ``render_spec``.
+    cache_dir
+      The cache directory.  If ``None``, a temporary directory is used
+      and removed afterwards, so charts are only shared within the one
+      call.
+
+    Return a ``dict`` with the numbers of charts ``rendered``, found
+    ``cached`` and ``written``, and a list of ``(output, error)``
+    ``errors``.  A specification that is not valid, or whose chart
+    cannot be rendered, cached or written, is reported in ``errors``
+    without stopping the others.
+    """
+    tmp_dir = None
+    if cache_dir is None:
+        cache_dir = tmp_dir = tempfile.mkdtemp(prefix='wwchartlib-')
+    try:
+        outputs = {}  # key -> output filenames
+        cached = set()
+        errors = []
+        todo = _new_charts(specs, cache_dir, outputs, cached, errors)
+
+        # the pool is only started if there is a chart to render; it
+        # reads the rest of the specifications as it renders
+        failed = {}
+        first = next(todo, None)
+        if first is not None:
+            pool = multiprocessing.Pool(processes, _init_worker)
+            try:
+                for key, error in pool.imap_unordered(
+                        _render_to_cache,
+                        itertools.chain([first], todo),
+                        chunksize):
+                    if error is not None:
+                        failed[key] = error
+            finally:
+                pool.close()
+                pool.join()
+
+        written = 0
+        for key, filenames in outputs.iteritems():
+            for filename in filenames:
+                if key in failed:
+                    errors.append((filename, failed[key]))
+                    continue
+                try:
+                    shutil.copyfile(_cache_path(cache_dir, key), filename)
+                except (IOError, OSError) as e:
+                    errors.append((filename, _error_message(e)))
+                    continue
+                written += 1
+        return {
+            'rendered': len(outputs) - len(cached) - len(failed),
+            'cached': len(cached),
+            'written': written,
+            'errors': errors,
+        }
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _read_specs(lines, errors):
+    """Yield the chart specifications read from lines of JSON.
+
+    Blank lines are skipped.  Lines that are not valid JSON are added
+    to the list ``errors`` as ``(line, error)``.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            errors.append(('line {}'.format(number), _error_message(e)))
+
+
+def main(argv=None):
+    """Render chart specifications read as JSON, one per line.
+
+    Usage: ``python -m wwchartlib.render [-j N] [--cache-dir DIR] [FILE]``
+
+    See ``render_spec`` for the specification format.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m wwchartlib.render',
+        description='Render chart specifications (JSON, one per line).'
+    )
+    parser.add_argument(
+        'file', nargs='?', type=argparse.FileType('r'), default=sys.stdin,
+        help='file of chart specifications (default: standard input)'
+    )
+    parser.add_argument(
+        '-j', '--processes', type=int, default=None,
+        help='number of worker processes (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='directory for caching rendered charts between runs'
+    )
+    args = parser.parse_args(argv)
+
+    errors = []
+    result = render_specs(
+        _read_specs(args.file, errors), args.cache_dir, args.processes)
+    errors.extend(result['errors'])
+    for filename, error in errors:
+        sys.stderr.write('{}: {}\n'.format(filename, error))
+    sys.stderr.write(
+        '{rendered} rendered, {cached} cached, {written} written\n'
+        .format(**result)
+    )
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Feed pie charts from streams of values.
+"""
+
+from __future__ import division
+
+import Queue
+
+from PySide.QtCore import *
+
+from . import piechart
+
+
+class ChartStream(QObject):
+    """Feeds a ``PieChart`` from a stream of values by category.
+
+    A running total is kept for each category, and the chart shows one
+    item for each category, labelled with the category, whose value is
+    the total.  The chart is put in value mode (see
+    ``PieChart.setValueMode``), so the fraction of each item is its
+    share of the sum of the totals.  Categories are added to the chart
+    in the order they first appear.  The stream owns the items of the
+    chart; the chart should not be given other items.
+
+    Updating a total is O(1).  The chart is updated from a timer, at
+    most ``maximumRate`` times per second, with the latest totals, so
+    however fast values arrive, intermediate states are dropped rather
+    than queued.
+    """
+    _min_poll_interval = 16  # ms between polls of an (empty) queue
+
+    def __init__(self, chart, rate=30, parent=None):
+        """Initialise the stream.
+
+        chart
+          The ``PieChart`` to feed.
+        rate
+          The maximum number of chart updates per second; see
+          ``setMaximumRate``.
+        parent
+          The parent ``QObject``.  Defaults to ``chart``.
+        """
+        super(ChartStream, self).__init__(
+            parent if parent is not None else chart)
+        self._chart = chart
+        chart.setValueMode(True)
+        self._totals = {}  # category -> total
+        self._items = {}  # category -> PieChartItem
+        self._new = []  # categories not yet in the chart
+        self._dirty = False  # totals changed since the chart was updated
+        self._rate = rate
+        self._clock = QElapsedTimer()  # time since the chart was updated
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._queue = None
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self._poll)
+
+    def chart(self):
+        """Return the chart fed by the stream."""
+        return self._chart
+
+    def setMaximumRate(self, rate):
+        """Set the maximum number of chart updates per second.
+
+        With a rate of ``0``, the chart is updated once per iteration
+        of the event loop.
+        """
+        self._rate = rate
+        if self._queue is not None:
+            self._poll_timer.start(self._poll_interval())
+
+    def maximumRate(self):
+        """Return the maximum number of chart updates per second."""
+        return self._rate
+
+    def _interval(self):
+        """Return the minimum interval between updates, in ms."""
+        return int(1000 / self._rate) if self._rate > 0 else 0
+
+    def _poll_interval(self):
+        """Return the interval between polls of the queue, in ms.
+
+        The queue is polled whether or not it is empty, so it is polled
+        at the maximum rate, but never more often than every
+        ``_min_poll_interval`` ms.
+        """
+        return max(self._interval(), self._min_poll_interval)
+
+    def add(self, category, amount=1):
+        """Add ``amount`` to the total of ``category``."""
+        self.setTotal(category, self._totals.get(category, 0) + amount)
+
+    def setTotal(self, category, total):
+        """Set the total of ``category``, which cannot be negative."""
+        if total < 0:
+            raise ValueError('Stream totals cannot be negative.')
+        if category not in self._totals:
+            self._new.append(category)
+        self._totals[category] = total
+        self._changed()
+
+    def feed(self, values):
+        """Add each ``(category, amount)`` in the iterable ``values``."""
+        for category, amount in values:
+            self.add(category, amount)
+
+    def total(self, category):
+        """Return the total of ``category`` (``0`` if it is unknown)."""
+        return self._totals.get(category, 0)
+
+    def totals(self):
+        """Return a ``dict`` of the total of each category."""
+        return dict(self._totals)
+
+    def setQueue(self, queue):
+        """Read ``(category, amount)`` pairs from a ``Queue.Queue``.
+
+        The queue is polled at the maximum rate (but no more often than
+        every 16 ms), from the thread of the stream, and the pairs are
+        added as by ``add``.  Other threads may put pairs in the queue;
+        give it a ``maxsize`` so that they block rather than build an
+        unbounded backlog if the stream falls behind.  Pass ``None`` to
+        stop reading the queue.
+        """
+        self._queue = queue
+        if queue is None:
+            self._poll_timer.stop()
+        else:
+            self._poll_timer.start(self._poll_interval())
+
+    def queue(self):
+        """Return the queue the stream reads, or ``None``."""
+        return self._queue
+
+    def _poll(self):
+        """Add the pairs waiting in the queue."""
+        # only as many as are waiting now, so that a fast producer
+        # cannot keep the stream polling forever
+        for i in xrange(self._queue.qsize()):
+            try:
+                category, amount = self._queue.get_nowait()
+            except Queue.Empty:
+                break
+            self.add(category, amount)
+
+    def clear(self):
+        """Forget all the categories, and remove their items."""
+        self._timer.stop()
+        self._totals = {}
+        self._items = {}
+        self._new = []
+        self._dirty = False
+        self._chart.setChartItems([])
+
+    def _changed(self):
+        """Schedule an update of the chart, if not already scheduled."""
+        self._dirty = True
+        if not self._timer.isActive():
+            interval = 0
+            if self._clock.isValid():
+                interval = max(self._interval() - self._clock.elapsed(), 0)
+            self._timer.start(interval)
+
+    def flush(self):
+        """Update the chart with the current totals now."""
+        self._timer.stop()
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._clock.start()
+
+        new_items = []
+        for category in self._new:
+            item = piechart.PieChartItem(label=category)
+            self._items[category] = item
+            new_items.append(item)
+        self._new = []
+
+        # the chart recomputes the fractions once, at the end
+        chart = self._chart
+        with chart.batchUpdate():
+            if new_items:
+                chart.insertChartItems(len(chart.chartItems()), new_items)
+            for category, item in self._items.items():
+                item.value = self._totals[category]
+            chart.updateChartItems()
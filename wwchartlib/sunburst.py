@@ -0,0 +1,299 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Sunburst chart widget.
+
+A sunburst chart is a pie chart of a tree: the top-level items are the
+slices of the centre, and the children of each item are drawn in the
+next ring out, over the arc of their parent.
+"""
+
+from __future__ import division
+
+import bisect
+import itertools
+
+from PySide.QtCore import *
+from PySide.QtGui import *
+
+from . import piechart
+from .core import angle_to_theta, polar
+
+
+def _ring_segment(inner, outer, start, span):
+    """Return a ``QPainterPath`` of a segment of a ring.
+
+    inner, outer
+      The bounding ``QRectF``s of the inner and outer edges of the ring.
+    start, span
+      The start angle and span of the segment, in Qt terms.
+    """
+    path = QPainterPath()
+    path.arcMoveTo(outer, start / 16)
+    path.arcTo(outer, start / 16, span / 16)
+    path.arcTo(inner, (start + span) / 16, -span / 16)
+    path.closeSubpath()
+    return path
+
+
+class SunburstItem(piechart.PieChartItem):
+    __slots__ = ('children', 'parent')
+
+    def __init__(self, fraction=None, children=None, **kwargs):
+        """Initialise the sunburst item.
+
+        fraction
+          The fraction of this item, in range ``0..1``: for a top-level
+          item, of the whole chart, otherwise of the arc of its parent.
+        children
+          Iterable of the child ``SunburstItem``s of this item.  These
+          are not checked; see ``SunburstChart.setChildItems``.
+        """
+        super(SunburstItem, self).__init__(fraction=fraction, **kwargs)
+
+        """The list of child ``SunburstItem``s; must not be modified."""
+        self.children = list(children) if children else []
+
+        """The parent ``SunburstItem``, or ``None``."""
+        self.parent = None
+        for child in self.children:
+            child.parent = self
+
+
+class SunburstChart(piechart.PieChart):
+    """Sunburst chart widget.
+
+    The top-level items are laid out and painted as a ``PieChart`` in
+    the centre of the chart.  The children of an item are only laid out
+    and painted if their ring is one of the ``ringCount`` rings shown,
+    and the arc of the item is at least ``expandThreshold`` pixels long,
+    so the cost of painting depends on the size of the chart rather
+    than the size of the tree.  The layout of the children of each item
+    is computed when first needed, and kept until the item's children
+    are changed with ``setChildItems`` (which only affects that branch)
+    or the top-level items change.
+    """
+    _item_class = SunburstItem
+    _ring_count = 3
+    _expand_threshold = 1
+
+    def __init__(self, items=None, **kwargs):
+        super(SunburstChart, self).__init__(**kwargs)
+        # id(item) -> (item, start, span, child starts, child spans)
+        self._child_layouts = {}
+        if items:
+            self.setChartItems(items)
+
+    def setRingCount(self, rings):
+        """Set the number of rings, including the centre.  Defaults to 3.
+
+        Raise ``ValueError`` if ``rings`` is less than ``1``.
+        """
+        if rings < 1:
+            raise ValueError('Ring count cannot be less than 1.')
+        self._ring_count = rings
+        self._items_changed()
+
+    def ringCount(self):
+        """Return the number of rings, including the centre."""
+        return self._ring_count
+
+    def setExpandThreshold(self, pixels):
+        """Set the minimum arc of an item whose children are shown.
+
+        The arc is measured along the outer edge of the ring of the
+        children.  Defaults to ``1``.
+        """
+        self._expand_threshold = pixels
+        self._items_changed()
+
+    def expandThreshold(self):
+        """Return the minimum arc of an item whose children are shown."""
+        return self._expand_threshold
+
+    def setChildItems(self, item, children):
+        """Set the children of a ``SunburstItem``.
+
+        The children are checked as the items of a ``PieChart`` are,
+        and cannot include ``item`` or its ancestors, the items of the
+        chart, or the children of another item.  The replaced children
+        are detached from ``item``.  Only the branch of the
+        chart containing ``item`` is laid out again and repainted.
+        """
+        children = [self._check_item(child) for child in children]
+        self._check_items(children)
+        ancestors = set()
+        ancestor = item
+        while ancestor is not None:
+            ancestors.add(id(ancestor))
+            ancestor = ancestor.parent
+        if any(id(child) in ancestors for child in children):
+            raise ValueError('Item cannot be a child of its descendant.')
+        for child in children:
+            if child.parent is not None and child.parent is not item:
+                raise ValueError('Item is already a child of another item.')
+            if self.hasChartItem(child):
+                raise ValueError('Item is already in the chart.')
+        self._drop_child_layouts(item)
+        for child in item.children:
+            child.parent = None
+        item.children = children
+        for child in children:
+            child.parent = item
+        root = item
+        while root.parent is not None:
+            root = root.parent
+        if self.hasChartItem(root):
+            layout = self._layout()
+            index = self.chartItemIndex(root)
+            self._items_changed(self._wedge_region(
+                layout.starts[index], layout.spans[index]))
+
+    def itemAt(self, pos):
+        """Return the ``SunburstItem`` at ``pos`` (a ``QPoint``).
+
+        Only the children on the path to the item are laid out, so this
+        is logarithmic in the number of children at each level.
+        """
+        layout = self._layout()
+        if layout.radius <= 0:
+            return None
+        radius, angle = polar(pos.x(), pos.y(), layout.origin)
+        ring = int(radius // layout.radius)
+        if ring >= self._ring_count:
+            return None
+        index = layout.slice_at(angle)
+        if index is None:
+            return None
+        item = self._items[index]
+        start, span = layout.starts[index], layout.spans[index]
+        for ring in xrange(1, ring + 1):
+            if not self._expanded(item, span, ring):
+                return None
+            starts, spans = self._child_layout(item, start, span)
+            index = bisect.bisect_right(starts, angle) - 1
+            if index < 0 or angle >= starts[index] + spans[index]:
+                return None
+            item = item.children[index]
+            start, span = starts[index], spans[index]
+        return item
+
+    def _layout_radius(self):
+        """The centre is the innermost of the rings."""
+        return self.radius / self._ring_count
+
+    def _wedge_region(self, start, span):
+        """Include the rings of children outside the wedge."""
+        return QRegion(self._outer_layout().wedge_rect(start, span))
+
+    def _outer_layout(self):
+        """Return an empty ``PieLayout`` of the whole chart."""
+        layout = self._layout()
+        return piechart.PieLayout(
+            (), layout.origin, layout.radius * self._ring_count)
+
+    def _expanded(self, item, span, ring):
+        """Return whether the children of an item are shown.
+
+        span
+          The span of the item, in Qt terms.
+        ring
+          The ring of the children.
+        """
+        return bool(item.children) and ring < self._ring_count \
+            and angle_to_theta(span) * self._layout().radius * (ring + 1) \
+            >= self._expand_threshold
+
+    def _child_layout(self, item, start, span):
+        """Return the start angles and spans of the children of an item.
+
+        start, span
+          The start angle and span of the item, in Qt terms.
+
+        Return ``(starts, spans)``.  The layout is cached, and the
+        children are coloured when it is computed.
+        """
+        entry = self._child_layouts.get(id(item))
+        if entry is not None and entry[0] is item \
+                and entry[1] == start and entry[2] == span:
+            return entry[3], entry[4]
+        starts = []
+        spans = []
+        angle = start
+        for i, child in enumerate(item.children):
+            child_span = child.fraction * span
+            starts.append(angle)
+            spans.append(child_span)
+            angle += child_span
+            # alternate shades of the parent's colour
+            child.colour = item.colour.lighter(110 if i % 2 else 125)
+        self._child_layouts[id(item)] = item, start, span, starts, spans
+        return starts, spans
+
+    def _drop_child_layouts(self, item):
+        """Discard the cached layouts of an item and its descendants.
+
+        Only descendants whose layouts are cached are visited.
+        """
+        stack = [item]
+        while stack:
+            node = stack.pop()
+            if self._child_layouts.pop(id(node), None) is not None:
+                stack.extend(node.children)
+
+    def _invalidate(self, region=None):
+        if region is None:
+            self._child_layouts = {}
+        super(SunburstChart, self)._invalidate(region)
+
+    def _paint_slices(self, p, region=None):
+        """Paint the centre, then the rings of children.
+
+        Branches outside ``region`` are skipped without being laid out.
+        """
+        super(SunburstChart, self)._paint_slices(p, region)
+        layout = self._layout()
+        width = layout.radius
+        if width <= 0:
+            return
+        outer = self._outer_layout()
+        x, y = layout.origin
+        rects = [
+            QRectF(x - r, y - r, 2 * r, 2 * r)
+            for r in (width * i for i in xrange(self._ring_count + 1))
+        ]
+        stack = [
+            (item, start, span, 1) for item, start, span in itertools.izip(
+                self._items, layout.starts, layout.spans)
+        ]
+        while stack:
+            item, start, span, ring = stack.pop()
+            if span <= 0 or not self._expanded(item, span, ring):
+                continue
+            if region is not None \
+                    and not region.intersects(outer.wedge_rect(start, span)):
+                continue
+            starts, spans = self._child_layout(item, start, span)
+            for child, child_start, child_span in \
+                    itertools.izip(item.children, starts, spans):
+                if child_span > 0:
+                    p.setBrush(QBrush(child.colour))
+                    p.drawPath(_ring_segment(
+                        rects[ring], rects[ring + 1], child_start, child_span
+                    ))
+                    stack.append((child, child_start, child_span, ring + 1))
+
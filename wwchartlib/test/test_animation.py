@@ -0,0 +1,66 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import wwchartlib.animation
+
+from . import qt
+
+
+class TestAnimator(qt.QtTestCase):
+    def setUp(self):
+        self.animator = wwchartlib.animation.Animator()
+
+    def test_frames(self):
+        calls = []
+
+        def animation(now):
+            calls.append(now)
+            return len(calls) < 2
+
+        self.animator.addAnimation(animation)
+        self.animator.addAnimation(animation)
+        self.assertTrue(self.animator._timer.isActive())
+        self.animator._frame()
+        self.assertEqual(len(calls), 1)
+        self.animator._frame()
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(self.animator._timer.isActive())
+
+    def test_budget(self):
+        calls = []
+
+        def animation(now):
+            calls.append(now)
+            return True
+
+        self.animator.addAnimation(animation)
+        self.animator._frame()
+        self.animator.addPaintTime(self.animator.budget + 1000)
+        # the frame went over budget; the following frames are dropped
+        self.animator._frame()
+        self.animator._frame()
+        self.assertEqual(len(calls), 1)
+        self.animator._resume = 0
+        self.animator._frame()
+        self.assertEqual(len(calls), 2)
+        self.animator.removeAnimation(animation)
+        self.assertFalse(self.animator._timer.isActive())
+
+    def test_shared(self):
+        self.assertIs(
+            wwchartlib.animation.animator(),
+            wwchartlib.animation.animator()
+        )
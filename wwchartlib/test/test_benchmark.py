@@ -0,0 +1,57 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import wwchartlib.benchmark
+import wwchartlib.piechart
+
+from . import qt
+
+
+class TestBenchmark(qt.QtTestCase):
+    def test_run(self):
+        result = wwchartlib.benchmark.run(
+            '/100?$', repeat=1, max_items=100)
+        self.assertListEqual(
+            sorted(result['results']),
+            ['add_item/10', 'add_item/100', 'drag/10', 'paint/10/100',
+             'set_items/10', 'set_items/100']
+        )
+        for seconds in result['results'].values():
+            self.assertGreater(seconds, 0)
+
+    def test_drag(self):
+        chart = wwchartlib.piechart.AdjustablePieChart(
+            items=wwchartlib.benchmark._items(10))
+        adjusted = []
+        chart.itemsAdjusted.connect(adjusted.append)
+        run = wwchartlib.benchmark._drag(chart, 20)
+        for i in xrange(3):
+            del adjusted[:]
+            run()
+            # every run drags the grip
+            self.assertEqual(len(adjusted), 20)
+        self.assertAlmostEqual(
+            chart.chartItems()[0].fraction, 1.0 / 11, delta=0.01)
+
+    def test_compare(self):
+        baseline = {'results': {'a': 1.0, 'b': 1.0, 'c': 1.0}}
+        current = {'results': {'a': 1.1, 'b': 2.0, 'd': 1.0}}
+        rows, regressions = wwchartlib.benchmark.compare(
+            baseline, current, 1.25)
+        self.assertListEqual(
+            [name for name, old, new, ratio in rows], ['a', 'b'])
+        self.assertAlmostEqual(rows[0][3], 1.1)
+        self.assertListEqual(regressions, ['b'])
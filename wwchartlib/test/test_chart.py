@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import threading
 import unittest
 
 from PySide.QtGui import *
@@ -38,6 +39,22 @@ class TestChartItem(unittest.TestCase):
         self.assertTrue(item.data)
 
 
+class TestChartStats(unittest.TestCase):
+    def test_stats(self):
+        stats = wwchartlib.chart.ChartStats()
+        stats.count('a')
+        stats.count('a', 2)
+        for value in 0.5, 3, 1000:
+            stats.record('b', value)
+        d = stats.as_dict()
+        self.assertEqual(d['a'], 3)
+        self.assertEqual(d['b']['count'], 3)
+        self.assertEqual(d['b']['total'], 1003.5)
+        self.assertEqual(d['b']['max'], 1000)
+        self.assertListEqual(
+            d['b']['histogram'], [1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1])
+
+
 class TestChart(qt.QtTestCase):
     i1 = wwchartlib.chart.ChartItem()
     i2 = wwchartlib.chart.ChartItem()
@@ -128,3 +145,119 @@ class TestChart(qt.QtTestCase):
     def test_add_bogus_item(self):
         with self.assertRaisesRegexp(TypeError, '[Nn]ot a .*ChartItem.*'):
             self.chart.addChartItem(1)
+
+    def test_item_index(self):
+        self.chart.setChartItems([self.i1, self.i2])
+        self.chart.addChartItem(self.i3, 0)
+        self.assertEqual(self.chart.chartItemIndex(self.i3), 0)
+        self.assertEqual(self.chart.chartItemIndex(self.i1), 1)
+        self.assertEqual(self.chart.chartItemIndex(self.i2), 2)
+        self.assertTrue(self.chart.hasChartItem(self.i1))
+        self.assertFalse(self.chart.hasChartItem(self.i4))
+        with self.assertRaisesRegexp(ValueError, '[Ii]tem is not in'):
+            self.chart.chartItemIndex(self.i4)
+
+        self.chart.removeChartItem(0)
+        self.assertFalse(self.chart.hasChartItem(self.i3))
+        self.assertEqual(self.chart.chartItemIndex(self.i1), 0)
+        self.assertEqual(self.chart.chartItemIndex(self.i2), 1)
+        self.chart.removeChartItem(-2)
+        self.assertEqual(self.chart.chartItemIndex(self.i2), 0)
+
+    def test_batch_update(self):
+        version = self.chart._version
+        with self.chart.batchUpdate():
+            self.chart.addChartItem(self.i1)
+            self.chart.addChartItem(self.i2)
+            self.chart.removeChartItem(0)
+            self.assertEqual(self.chart._version, version)
+        self.assertEqual(self.chart._version, version + 1)
+        self.assertListEqual(self.chart.chartItems(), [self.i2])
+
+        # nested batch updates; chart is updated when outermost ends
+        self.chart.beginUpdate()
+        self.chart.beginUpdate()
+        self.chart.addChartItem(self.i3)
+        self.chart.endUpdate()
+        self.assertEqual(self.chart._version, version + 1)
+        self.chart.endUpdate()
+        self.assertEqual(self.chart._version, version + 2)
+
+        with self.assertRaisesRegexp(RuntimeError, 'without beginUpdate'):
+            self.chart.endUpdate()
+
+    def test_batch_update_error(self):
+        self.chart.setChartItems([self.i1])
+
+        # items are still checked as they are added
+        with self.assertRaisesRegexp(TypeError, '[Nn]ot a .*ChartItem.*'):
+            with self.chart.batchUpdate():
+                self.chart.addChartItem(self.i2)
+                self.chart.addChartItem(1)
+
+        # the batch update had no effect
+        self.assertListEqual(self.chart.chartItems(), [self.i1])
+        self.assertFalse(self.chart.hasChartItem(self.i2))
+
+    def test_insert_remove_items(self):
+        self.chart.setChartItems([self.i1, self.i2])
+        self.chart.insertChartItems(1, [self.i3, self.i4])
+        self.assertListEqual(
+            self.chart.chartItems(),
+            [self.i1, self.i3, self.i4, self.i2]
+        )
+        self.assertEqual(self.chart.chartItemIndex(self.i2), 3)
+        with self.assertRaisesRegexp(ValueError, '[Ii]tem is already in'):
+            self.chart.insertChartItems(0, [self.i5, self.i1])
+
+        self.assertListEqual(
+            self.chart.removeChartItems(0, 2),
+            [self.i1, self.i3]
+        )
+        self.assertListEqual(self.chart.chartItems(), [self.i4, self.i2])
+        self.assertEqual(self.chart.chartItemIndex(self.i2), 1)
+        self.assertFalse(self.chart.hasChartItem(self.i1))
+
+    def test_stats(self):
+        self.assertIsNone(self.chart.stats())
+        self.assertFalse(self.chart.isStatsEnabled())
+        self.chart.setStatsEnabled(True)
+        self.assertTrue(self.chart.isStatsEnabled())
+        self.chart.setChartItems([self.i1])
+        self.chart.addChartItem(self.i2)
+        self.assertEqual(self.chart.stats()['items_changed'], 2)
+
+        recorded = []
+        self.chart.statsRecorded.connect(
+            lambda name, value: recorded.append((name, value)))
+        self.chart._record('x', 2)
+        self.assertListEqual(recorded, [('x', 2)])
+        self.assertEqual(self.chart.stats()['x']['count'], 1)
+
+        self.chart.resetStats()
+        self.assertDictEqual(self.chart.stats(), {})
+        self.chart.setStatsEnabled(False)
+        self.assertIsNone(self.chart.stats())
+
+    def test_post_update(self):
+        calls = []
+        self.chart.postUpdate(lambda chart: calls.append(1), 'a')
+        self.chart.postUpdate(lambda chart: calls.append(2))
+        self.chart.postUpdate(lambda chart: calls.append(3), 'a')
+        thread = threading.Thread(
+            target=self.chart.postChartItems, args=(self.items,))
+        thread.start()
+        thread.join()
+        self.chart.postUpdate(lambda chart: calls.append(4))
+        # nothing is applied until the event loop runs
+        self.assertListEqual(self.chart.chartItems(), [])
+        QApplication.processEvents()
+        self.assertListEqual(self.chart.chartItems(), self.items)
+        # the items replaced the updates posted before them
+        self.assertListEqual(calls, [4])
+
+        self.chart.postUpdate(lambda chart: calls.append(5), 'a')
+        self.chart.postUpdate(lambda chart: calls.append(6))
+        self.chart.postUpdate(lambda chart: calls.append(7), 'a')
+        QApplication.processEvents()
+        self.assertListEqual(calls, [4, 6, 7])
@@ -0,0 +1,70 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import subprocess
+import sys
+import unittest
+
+import wwchartlib
+import wwchartlib.core
+
+
+class TestCore(unittest.TestCase):
+    def test_no_qt(self):
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.path.dirname(
+            os.path.dirname(os.path.abspath(wwchartlib.__file__)))
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, wwchartlib.core, wwchartlib.fenwick; '
+            'print(sorted(m for m in sys.modules if "PySide" in m))'
+        ], env=env)
+        self.assertEqual(output.strip(), b'[]')
+
+    def test_clamp_angle(self):
+        clamp = wwchartlib.core.clamp_angle
+        self.assertEqual(clamp(720, 0, 1440), 720)
+        # just past the end
+        self.assertEqual(clamp(1500, 0, 1440), 1440)
+        # past the start, through 0 degrees
+        self.assertEqual(clamp(5700, 0, 1440), 0)
+        self.assertEqual(clamp(1000, 1440, 4320), 1440)
+        self.assertEqual(clamp(5000, 1440, 4320), 4320)
+
+    def test_normalise(self):
+        fractions, total = wwchartlib.core.normalise([1, 3, 0])
+        self.assertListEqual(fractions, [0.25, 0.75, 0])
+        self.assertEqual(total, 4)
+        self.assertListEqual(
+            wwchartlib.core.normalise([0, 0])[0], [0, 0])
+        # the naive sum of the fractions never rounds over 1
+        fractions, total = wwchartlib.core.normalise([0.1] * 100)
+        self.assertAlmostEqual(total, 10)
+        self.assertLessEqual(sum(fractions), 1)
+
+    def test_layout(self):
+        layout = wwchartlib.core.PieLayout([0.25, 0, 0.5], (50, 40), 30)
+        self.assertListEqual(layout.starts, [0, 1440, 1440])
+        self.assertListEqual(layout.spans, [1440, 0, 2880])
+        self.assertEqual(layout.slice_at(2000), 2)
+        left, top, right, bottom = layout.wedge_bounds(0, 1440)
+        self.assertAlmostEqual(left, 50)
+        self.assertAlmostEqual(top, 10)
+        self.assertAlmostEqual(right, 80)
+        self.assertAlmostEqual(bottom, 40)
+        self.assertTupleEqual(
+            layout.wedge_bounds(0, 5760), (20, 10, 80, 70))
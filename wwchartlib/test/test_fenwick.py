@@ -0,0 +1,57 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import random
+import unittest
+
+import wwchartlib.fenwick
+
+
+class TestFenwickTree(unittest.TestCase):
+    def setUp(self):
+        self.values = [3, 0, 1, 4, 1, 5, 9, 2, 6]
+        self.tree = wwchartlib.fenwick.FenwickTree(self.values)
+
+    def check(self):
+        self.assertEqual(len(self.tree), len(self.values))
+        for i in xrange(len(self.values) + 1):
+            self.assertEqual(self.tree.prefix_sum(i), sum(self.values[:i]))
+        self.assertEqual(self.tree.total(), sum(self.values))
+
+    def test_init(self):
+        self.check()
+        self.assertListEqual(list(self.tree), self.values)
+        self.assertEqual(wwchartlib.fenwick.FenwickTree().total(), 0)
+
+    def test_setitem(self):
+        rand = random.Random(0)
+        for i in xrange(50):
+            index = rand.randrange(-len(self.values), len(self.values))
+            self.values[index] = self.tree[index] = rand.randrange(10)
+            self.check()
+
+    def test_append_pop(self):
+        for value in xrange(20):
+            self.values.append(value)
+            self.tree.append(value)
+            self.check()
+        while self.values:
+            self.assertEqual(self.tree.pop(), self.values.pop())
+            self.check()
+        with self.assertRaises(IndexError):
+            self.tree.pop()
+        self.tree.append(1)
+        self.assertEqual(self.tree.total(), 1)
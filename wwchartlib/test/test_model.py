@@ -0,0 +1,104 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from PySide.QtCore import *
+from PySide.QtGui import *
+
+import wwchartlib.chart
+import wwchartlib.model
+import wwchartlib.piechart
+
+from . import qt
+
+
+class TestChartItemModel(qt.QtTestCase):
+    def setUp(self):
+        self.items = [
+            wwchartlib.piechart.PieChartItem(fraction=0.25, label=x)
+            for x in 'abc'
+        ]
+        self.model = wwchartlib.model.ChartItemModel(self.items[:2])
+        self.chart = wwchartlib.piechart.PieChart()
+        self.chart.setModel(self.model)
+
+    def test_data(self):
+        self.assertEqual(self.model.rowCount(), 2)
+        index = self.model.index(1, 0)
+        self.assertEqual(self.model.data(index), u'b')
+        self.assertIs(
+            self.model.data(index, wwchartlib.model.ChartItemModel.ItemRole),
+            self.items[1]
+        )
+        self.assertTrue(self.model.setData(index, 7))
+        self.assertEqual(self.items[1].value, 7)
+
+    def test_bind(self):
+        self.assertIs(self.chart.model(), self.model)
+        self.assertListEqual(self.chart.chartItems(), self.items[:2])
+
+    def test_insert_remove(self):
+        self.model.insertItems(1, self.items[2:])
+        self.assertListEqual(
+            self.chart.chartItems(),
+            [self.items[0], self.items[2], self.items[1]]
+        )
+        self.model.removeItems(0, 2)
+        self.assertListEqual(self.chart.chartItems(), self.items[1:2])
+        self.assertEqual(self.chart.chartItemIndex(self.items[1]), 0)
+
+    def test_item_changed(self):
+        version = self.chart._version
+        self.items[0].fraction = 0.5
+        self.model.itemChanged(self.items[0])
+        self.assertEqual(self.chart._version, version + 1)
+        self.assertListEqual(list(self.chart.chartFractions()), [0.5, 0.25])
+
+    def test_unbind(self):
+        self.chart.setModel(None)
+        self.model.appendItem(self.items[2])
+        self.assertListEqual(self.chart.chartItems(), self.items[:2])
+
+
+class TestGenericModel(qt.QtTestCase):
+    def test_standard_item_model(self):
+        model = QStandardItemModel(0, 2)
+        for label, value in ('a', 0.25), ('b', 0.5):
+            value_item = QStandardItem()
+            value_item.setData(value, Qt.EditRole)
+            model.appendRow([QStandardItem(label), value_item])
+        chart = wwchartlib.piechart.PieChart()
+        chart.setModel(model)
+        self.assertListEqual(
+            [(item.label, item.fraction) for item in chart.chartItems()],
+            [('a', 0.25), ('b', 0.5)]
+        )
+
+        layout = chart._layout()
+        model.item(0, 1).setData(0.125, Qt.EditRole)
+        self.assertEqual(chart.chartItems()[0].fraction, 0.125)
+        # the layout is updated in place
+        self.assertIs(chart._layout(), layout)
+        self.assertListEqual(layout.spans, [720, 2880])
+        self.assertListEqual(layout.starts, [0, 720])
+
+        # a change that takes the sum over 1 is rolled back
+        model.item(0, 1).setData(0.75, Qt.EditRole)
+        self.assertEqual(chart.chartItems()[0].fraction, 0.125)
+        self.assertListEqual(list(chart.chartFractions()), [0.125, 0.5])
+
+        model.removeRow(0)
+        self.assertListEqual(
+            [item.label for item in chart.chartItems()], ['b'])
@@ -0,0 +1,61 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from PySide.QtGui import *
+
+import wwchartlib.palette
+
+
+class TestPalette(unittest.TestCase):
+    def test_hsv(self):
+        table = wwchartlib.palette.colour_table(3)
+        self.assertListEqual(
+            [colour.hue() for colour in table],
+            [0, 120, 240]
+        )
+        self.assertEqual(table[0], QColor.fromHsv(0, 191, 255))
+
+    def test_cached(self):
+        table = wwchartlib.palette.colour_table(5, 'golden')
+        self.assertIs(wwchartlib.palette.colour_table(5, 'golden'), table)
+        self.assertIsNot(wwchartlib.palette.colour_table(5, 'hsv'), table)
+
+    def test_golden(self):
+        # colours do not depend on the number of colours
+        self.assertTupleEqual(
+            wwchartlib.palette.colour_table(3, 'golden'),
+            wwchartlib.palette.colour_table(10, 'golden')[:3]
+        )
+        self.assertEqual(
+            wwchartlib.palette.colour(20),
+            wwchartlib.palette.colour_table(21, 'golden')[20]
+        )
+
+    def test_schemes(self):
+        self.assertIn('hsv', wwchartlib.palette.schemes())
+        # the registry is global; unregister the scheme afterwards
+        self.addCleanup(wwchartlib.palette._tables.clear)
+        self.addCleanup(wwchartlib.palette._schemes.pop, 'black', None)
+        wwchartlib.palette.register_scheme(
+            'black', lambda n: (QColor(0, 0, 0) for i in xrange(n)))
+        self.assertEqual(
+            wwchartlib.palette.colour_table(1, 'black')[0],
+            QColor(0, 0, 0)
+        )
+        with self.assertRaisesRegexp(ValueError, 'Unknown colour scheme'):
+            wwchartlib.palette.colour_table(1, 'bogus')
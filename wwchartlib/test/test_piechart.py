@@ -16,14 +16,56 @@
 
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from PySide.QtCore import *
 from PySide.QtGui import *
 
 import wwchartlib.chart
+import wwchartlib.palette
 import wwchartlib.piechart
 
 from . import qt
 
 
+class TestAngleFunctions(unittest.TestCase):
+    def test_slice_angles(self):
+        starts, spans = wwchartlib.piechart.slice_angles([0.25, 0, 0.5])
+        self.assertListEqual(starts, [0, 1440, 1440])
+        self.assertListEqual(spans, [1440, 0, 2880])
+
+    def test_opposite_angle(self):
+        self.assertEqual(wwchartlib.piechart.opposite_angle(0), 2880)
+        self.assertEqual(wwchartlib.piechart.opposite_angle(5000), 2120)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not available')
+    def test_arrays(self):
+        fractions = numpy.array([0.25, 0, 0.5])
+        starts, spans = wwchartlib.piechart.slice_angles(fractions)
+        self.assertListEqual(starts.tolist(), [0, 1440, 1440])
+        self.assertListEqual(spans.tolist(), [1440, 0, 2880])
+        self.assertListEqual(
+            wwchartlib.piechart.opposite_angle(
+                numpy.array([0, 2880, 5000, 5760])).tolist(),
+            [2880, 0, 2120, 2880]
+        )
+
+        angles, xs, ys = wwchartlib.piechart.boundary_points(
+            starts, spans, (50, 40), 30)
+        for angle, x, y in zip(angles, xs, ys):
+            expected = wwchartlib.piechart.cartesian(angle, (50, 40), 30)
+            self.assertAlmostEqual(x, expected[0])
+            self.assertAlmostEqual(y, expected[1])
+
+        radii, angles = wwchartlib.piechart.polar(
+            numpy.array([80, 50, 20]), numpy.array([40, 10, 40]), (50, 40))
+        self.assertListEqual(radii.tolist(), [30, 30, 30])
+        self.assertListEqual(angles.tolist(), [0, 1440, 2880])
+
+
 class TestPieChartItem(unittest.TestCase):
     def test_base(self):
         self.assertTrue(issubclass(
@@ -46,6 +88,76 @@ class TestPieChartItem(unittest.TestCase):
         item = wwchartlib.piechart.PieChartItem(fraction=2)
         self.assertIs(item.fraction, 2)
 
+    def test_slots(self):
+        item = wwchartlib.piechart.PieChartItem()
+        self.assertFalse(hasattr(item, '__dict__'))
+
+
+class TestPieLayout(unittest.TestCase):
+    def test_init(self):
+        layout = wwchartlib.piechart.PieLayout([0.25, 0, 0.5], (50, 40), 30)
+        self.assertEqual(layout.rect, QRect(20, 10, 60, 60))
+        self.assertListEqual(layout.starts, [0, 1440, 1440])
+        self.assertListEqual(layout.spans, [1440, 0, 2880])
+        self.assertListEqual(layout.grips, [])
+
+    def test_cartesian(self):
+        layout = wwchartlib.piechart.PieLayout([], (50, 40), 30)
+        x, y = layout.cartesian(0)
+        self.assertAlmostEqual(x, 80)
+        self.assertAlmostEqual(y, 40)
+        x, y = layout.cartesian(90 * 16)
+        self.assertAlmostEqual(x, 50)
+        self.assertAlmostEqual(y, 10)
+
+    def test_wedge_rect(self):
+        layout = wwchartlib.piechart.PieLayout([], (50, 40), 30)
+        self.assertEqual(
+            layout.wedge_rect(0, 90 * 16),
+            QRect(QPoint(48, 8), QPoint(82, 42))
+        )
+        self.assertEqual(
+            layout.wedge_rect(45 * 16, 90 * 16),
+            QRect(QPoint(26, 8), QPoint(74, 42))
+        )
+        self.assertEqual(
+            layout.wedge_rect(0, 360 * 16),
+            QRect(18, 8, 64, 64)
+        )
+
+    def test_slice_at(self):
+        layout = wwchartlib.piechart.PieLayout(
+            [0.25, 0, 0.5, 0], (50, 40), 30)
+        self.assertEqual(layout.slice_at(0), 0)
+        self.assertEqual(layout.slice_at(1439), 0)
+        self.assertEqual(layout.slice_at(1440), 2)
+        self.assertEqual(layout.slice_at(4319), 2)
+        self.assertIsNone(layout.slice_at(4320))
+        self.assertIsNone(layout.slice_at(5000))
+
+    def test_wedges(self):
+        # at radius 40, 0.001 of the circumference is 0.25 pixels
+        fractions = [0.001] * 3 + [0.25, 0, 0.001, 0.25] + [0.001] * 4
+        layout = wwchartlib.piechart.PieLayout(fractions, (50, 50), 40)
+        wedges = layout.wedges(1)
+        self.assertIs(layout.wedges(1), wedges)
+        self.assertListEqual(
+            [index for start, span, index in wedges],
+            [None, 3, 5, 6, None]
+        )
+        start, span, index = wedges[0]
+        self.assertEqual(start, 0)
+        self.assertAlmostEqual(span, layout.starts[3])
+        start, span, index = wedges[-1]
+        self.assertAlmostEqual(start, layout.starts[7])
+        self.assertAlmostEqual(span, layout.spans[7] * 4)
+
+        # with no threshold, every non-empty slice is a wedge
+        self.assertListEqual(
+            [index for start, span, index in layout.wedges(0)],
+            [0, 1, 2, 3, 5, 6, 7, 8, 9, 10]
+        )
+
 
 class TestPieChart(qt.QtTestCase):
     def setUp(self):
@@ -64,6 +176,357 @@ class TestPieChart(qt.QtTestCase):
             )
         )
 
+    def test_cache(self):
+        self.assertFalse(self.chart.isCacheEnabled())
+        self.chart.setCacheEnabled(True)
+        self.assertTrue(self.chart.isCacheEnabled())
+        self.chart.resize(100, 100)
+        self.chart.addChartItem(wwchartlib.piechart.PieChartItem(fraction=1))
+        pixmap = self.chart._cached_slices()
+        self.assertEqual(pixmap.size(), QSize(100, 100))
+        self.assertIs(self.chart._cached_slices(), pixmap)
+
+        # changing the items or the size discards the cached pixmap
+        self.chart.removeChartItem(0)
+        self.assertIsNot(self.chart._cached_slices(), pixmap)
+        pixmap = self.chart._cached_slices()
+        self.chart.resize(50, 100)
+        self.assertIsNot(self.chart._cached_slices(), pixmap)
+
+    def test_batch_update(self):
+        items = [
+            wwchartlib.piechart.PieChartItem(fraction=0.25)
+            for x in range(4)
+        ]
+        with self.chart.batchUpdate():
+            for item in items:
+                self.chart.addChartItem(item)
+        self.assertListEqual(self.chart.chartItems(), items)
+        self.assertEqual(len(set(item.colour.hue() for item in items)), 4)
+
+        # the sum is checked at the end of the batch
+        self.chart.beginUpdate()
+        self.chart.removeChartItem(0)
+        self.chart.addChartItem(wwchartlib.piechart.PieChartItem(fraction=1))
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ss]um of.*fractions cannot be greater than 1'
+        ):
+            self.chart.endUpdate()
+
+        # check that the (failed) batch update had no effect
+        self.assertListEqual(self.chart.chartItems(), items)
+
+    def test_stable_colours(self):
+        items = [
+            wwchartlib.piechart.PieChartItem(fraction=0.25)
+            for x in range(3)
+        ]
+        self.chart.setChartItems(items[:2])
+        self.assertEqual(items[0].colour.hue(), 0)
+        self.assertEqual(items[1].colour.hue(), 180)
+
+        self.chart.setStableColours(True)
+        self.assertTrue(self.chart.stableColours())
+        self.chart.addChartItem(items[2])
+        self.assertEqual(items[0].colour.hue(), 0)
+        self.assertEqual(items[1].colour.hue(), 180)
+        self.assertNotIn(items[2].colour.hue(), (0, 180))
+
+        # the colours of removed items are reused
+        self.chart.removeChartItem(1)
+        self.chart.addChartItem(items[1])
+        self.assertEqual(items[1].colour, wwchartlib.palette.colour(1))
+        self.chart.setChartFractions([0.25] * 3)
+        self.assertListEqual(
+            [item.colour for item in self.chart.chartItems()],
+            [wwchartlib.palette.colour(i) for i in range(3)]
+        )
+        self.chart.setChartItems(items)
+
+        # disabling stable colours reassigns all the colours
+        self.chart.setStableColours(False)
+        self.assertListEqual(
+            [item.colour.hue() for item in items],
+            [0, 120, 240]
+        )
+
+    def test_set_fractions(self):
+        self.chart.setChartFractions([0.5, 0.25], labels=['a', 'b'])
+        items = self.chart.chartItems()
+        self.assertListEqual([item.fraction for item in items], [0.5, 0.25])
+        self.assertListEqual([item.label for item in items], ['a', 'b'])
+        self.assertListEqual(list(self.chart.chartFractions()), [0.5, 0.25])
+
+        with self.assertRaisesRegexp(
+            TypeError,
+            '[Ff]raction must be a [Nn]umber'
+        ):
+            self.chart.setChartFractions([0.5, 'foo'])
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ff]raction cannot be less than 0'
+        ):
+            self.chart.setChartFractions([0.5, -0.5])
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ss]um of.*fractions cannot be greater than 1'
+        ):
+            self.chart.setChartFractions([0.5, 0.75])
+        # summed as setChartItems sums them
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ss]um of.*fractions cannot be greater than 1'
+        ):
+            self.chart.setChartFractions([0.01] * 100)
+        with self.assertRaisesRegexp(ValueError, 'one label for each'):
+            self.chart.setChartFractions([0.25, 0.25], labels=['a'])
+
+        # check that the (failed) operations had no effect
+        self.assertListEqual(self.chart.chartItems(), items)
+
+    def test_set_item_fraction(self):
+        items = [
+            wwchartlib.piechart.PieChartItem(fraction=f)
+            for f in (0.25, 0.25)
+        ]
+        self.chart.setChartItems(items)
+        self.chart.addChartItem(wwchartlib.piechart.PieChartItem(0.25))
+        self.chart.setItemFraction(1, 0.5)
+        self.assertEqual(items[1].fraction, 0.5)
+        self.assertListEqual(
+            list(self.chart.chartFractions()), [0.25, 0.5, 0.25])
+
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ss]um of.*fractions cannot be greater than 1'
+        ):
+            self.chart.setItemFraction(0, 0.5)
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ff]raction cannot be less than 0'
+        ):
+            self.chart.setItemFraction(0, -0.5)
+        self.assertEqual(items[0].fraction, 0.25)
+
+        # the sum check sees the updated fractions
+        self.chart.removeChartItem(-1)
+        self.chart.setItemFraction(0, 0.5)
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ff]raction is too large'
+        ):
+            self.chart.addChartItem(
+                wwchartlib.piechart.PieChartItem(fraction=0.25))
+        self.assertListEqual(list(self.chart.chartFractions()), [0.5, 0.5])
+
+        # only the changed slices are laid out again
+        layout = self.chart._layout()
+        self.chart.setItemFraction(0, 0.25)
+        self.assertIs(self.chart._layout(), layout)
+        self.assertListEqual(layout.starts, [0, 1440])
+        self.assertListEqual(layout.spans, [1440, 2880])
+
+        # a failed batch update restores the fractions
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ss]um of.*fractions cannot be greater than 1'
+        ):
+            with self.chart.batchUpdate():
+                self.chart.setItemFraction(0, 0.75)
+        self.assertListEqual([item.fraction for item in items], [0.25, 0.5])
+        self.assertListEqual(list(self.chart.chartFractions()), [0.25, 0.5])
+
+    def test_remove_last_item(self):
+        item = wwchartlib.piechart.PieChartItem(fraction=0.5)
+        self.chart.addChartItem(item)
+        self.chart.removeChartItem(-1)
+        with self.assertRaises(IndexError):
+            self.chart.removeChartItem(-1)
+        self.chart.addChartItem(item)
+        self.assertListEqual(list(self.chart.chartFractions()), [0.5])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not available')
+    def test_remove_item_fractions_in_use(self):
+        self.chart.setChartFractions([0.25, 0.5])
+        self.chart.addChartItem(wwchartlib.piechart.PieChartItem(0.125))
+        view = numpy.frombuffer(self.chart.chartFractions(), dtype=float)
+        self.chart.removeChartItem(-1)
+        self.assertListEqual(list(self.chart.chartFractions()), [0.25, 0.5])
+        # the sum check sees the removal
+        self.chart.addChartItem(wwchartlib.piechart.PieChartItem(0.25))
+        del view
+
+    def test_item_at(self):
+        items = [
+            wwchartlib.piechart.PieChartItem(fraction=f, label=l)
+            for f, l in ((0.25, 'a'), (0.5, 'b'))
+        ]
+        self.chart.setChartItems(items)
+        self.chart.resize(200, 200)
+        radius = self.chart.radius
+        self.assertIs(self.chart.itemAt(QPoint(150, 90)), items[0])
+        self.assertIs(self.chart.itemAt(QPoint(90, 150)), items[1])
+        self.assertIsNone(self.chart.itemAt(QPoint(150, 150)))
+        self.assertIsNone(self.chart.itemAt(QPoint(100 + radius + 1, 99)))
+
+        self.assertEqual(self.chart._tool_tip(items[0]), 'a: 25.0%')
+        items[1].value = 42
+        self.assertEqual(self.chart._tool_tip(items[1]), 'b: 42')
+
+    def test_hover(self):
+        items = [
+            wwchartlib.piechart.PieChartItem(fraction=f)
+            for f in (0.25, 0.5)
+        ]
+        self.chart.setChartItems(items)
+        self.chart.resize(200, 200)
+
+        def move(x, y):
+            self.chart.mouseMoveEvent(QMouseEvent(
+                QEvent.MouseMove, QPoint(x, y),
+                Qt.NoButton, Qt.NoButton, Qt.NoModifier
+            ))
+
+        move(150, 90)
+        self.assertIsNone(self.chart._hovered)
+        self.chart.setHoverEnabled(True)
+        self.assertTrue(self.chart.hasMouseTracking())
+        move(150, 90)
+        self.assertEqual(self.chart._hovered, 0)
+        move(90, 150)
+        self.assertEqual(self.chart._hovered, 1)
+        move(150, 150)
+        self.assertIsNone(self.chart._hovered)
+
+        # highlight is dropped when the items change
+        move(90, 150)
+        self.chart.setChartItems(items[:1])
+        self.assertIsNone(self.chart._hovered)
+
+    def test_animation(self):
+        items = [
+            wwchartlib.piechart.PieChartItem(fraction=f)
+            for f in (0.25, 0.25)
+        ]
+        self.chart.setChartItems(items)
+        self.chart.resize(200, 200)
+        self.chart.setAnimationDuration(100)
+        self.assertEqual(self.chart.animationDuration(), 100)
+        self.chart.show()
+        self.chart._layout()  # as if painted
+
+        items[0].fraction = 0.75
+        self.chart.updateChartItems()
+        start, end, start_time = self.chart._animation
+        self.assertListEqual(list(start), [0.25, 0.25])
+        self.assertListEqual(list(end), [0.75, 0.25])
+        self.assertTrue(self.chart._animation_frame(start_time + 50))
+        self.assertAlmostEqual(
+            self.chart._layout().spans[0],
+            wwchartlib.piechart.fraction_to_angle(0.5)
+        )
+
+        # a change mid-transition starts from the spans shown
+        items[0].fraction = 0.25
+        self.chart.updateChartItems()
+        start, end, start_time = self.chart._animation
+        self.assertAlmostEqual(start[0], 0.5)
+        self.assertAlmostEqual(end[0], 0.25)
+        self.assertFalse(self.chart._animation_frame(start_time + 100))
+        self.assertIsNone(self.chart._animation)
+        self.assertAlmostEqual(
+            self.chart._layout().spans[0],
+            wwchartlib.piechart.fraction_to_angle(0.25)
+        )
+        self.chart.setAnimationDuration(0)
+
+    def test_post_fractions(self):
+        self.chart.postChartFractions([0.25, 0.25])
+        self.chart.postItemFraction(0, 0.75)
+        self.chart.postItemFraction(0, 0.5)
+        QApplication.processEvents()
+        self.assertListEqual(
+            [item.fraction for item in self.chart.chartItems()], [0.5, 0.25])
+
+    def test_post_invalid_fraction(self):
+        self.chart.setChartFractions([0.25, 0.25])
+        with self.assertRaisesRegexp(ValueError, 'cannot be greater than 1'):
+            self.chart.postItemFraction(0, 2)
+        self.chart.postItemFraction(0, 0.9)
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ss]um of.*fractions cannot be greater than 1'
+        ):
+            self.chart._apply_posted()
+        # the batch of posted updates is rolled back
+        self.assertListEqual(
+            [item.fraction for item in self.chart.chartItems()],
+            [0.25, 0.25]
+        )
+        self.assertListEqual(list(self.chart.chartFractions()), [0.25, 0.25])
+
+    def test_value_mode(self):
+        items = [
+            wwchartlib.piechart.PieChartItem(value=v) for v in (1, 3, None)
+        ]
+        self.chart.setChartItems(items)
+        self.chart.setValueMode(True)
+        self.assertTrue(self.chart.isValueMode())
+        self.assertEqual(self.chart.valueTotal(), 4)
+        self.assertListEqual(
+            [item.fraction for item in items], [0.25, 0.75, 0])
+
+        self.chart.setStatsEnabled(True)
+        self.chart.setItemValue(0, 2)
+        self.chart.setItemValue(2, 3)
+        self.assertEqual(self.chart.valueTotal(), 8)
+        # fractions are recomputed once, in the event loop
+        self.assertEqual(items[0].fraction, 0.25)
+        QApplication.processEvents()
+        self.assertListEqual(
+            [item.fraction for item in items], [0.25, 0.375, 0.375])
+        self.assertEqual(self.chart.stats()['items_changed'], 1)
+
+        # fractions of added items are replaced
+        self.chart.addChartItem(
+            wwchartlib.piechart.PieChartItem(fraction=1, value=8))
+        self.assertAlmostEqual(self.chart.chartItems()[-1].fraction, 0.5)
+
+        with self.assertRaisesRegexp(ValueError, 'cannot be less than 0'):
+            self.chart.setItemValue(0, -1)
+        with self.assertRaisesRegexp(TypeError, 'must be a Number'):
+            self.chart.setItemValue(0, 'foo')
+
+    def test_value_mode_fractions(self):
+        items = [
+            wwchartlib.piechart.PieChartItem(value=v) for v in (1, 3)
+        ]
+        self.chart.setChartItems(items)
+        self.chart.setValueMode(True)
+
+        # fractions follow the values, so they cannot be set
+        with self.assertRaisesRegexp(RuntimeError, 'in value mode'):
+            self.chart.setItemFraction(0, 0.5)
+        with self.assertRaisesRegexp(RuntimeError, 'in value mode'):
+            self.chart.postItemFraction(0, 0.5)
+        with self.assertRaisesRegexp(RuntimeError, 'in value mode'):
+            self.chart.setChartFractions([0.5, 0.5])
+        with self.assertRaisesRegexp(RuntimeError, 'in value mode'):
+            self.chart.postChartFractions([0.5, 0.5])
+        self.assertListEqual([item.fraction for item in items], [0.25, 0.75])
+
+        # fractions of items that are not added are left alone
+        new = wwchartlib.piechart.PieChartItem(fraction=0.5, value=1)
+        with self.assertRaisesRegexp(ValueError, 'multiple times'):
+            self.chart.insertChartItems(0, [new, new])
+        self.assertEqual(new.fraction, 0.5)
+        with self.assertRaisesRegexp(TypeError, 'must be a Number'):
+            self.chart.setChartItems([
+                new, wwchartlib.piechart.PieChartItem(fraction='foo')])
+        self.assertEqual(new.fraction, 0.5)
+        self.assertIs(self.chart.chartItems()[0], items[0])
+
     def test_add_item_with_non_number_fraction(self):
         # fraction of 0.5 should work
         item = wwchartlib.piechart.PieChartItem(fraction=0.5)
@@ -187,3 +650,160 @@ class TestPieChart(qt.QtTestCase):
         # check that the (failed) operation had no effect
         # (the list should be that from the earlier setChartItems
         self.assertListEqual(self.chart.chartItems(), [itemA, itemB])
+
+
+class TestAdjustablePieChart(qt.QtTestCase):
+    def setUp(self):
+        self.items = [
+            wwchartlib.piechart.PieChartItem(fraction=f)
+            for f in (0.25, 0, 0.25, 0.5)
+        ]
+        self.chart = wwchartlib.piechart.AdjustablePieChart(items=self.items)
+        self.chart.resize(200, 200)
+
+    def test_grips_at(self):
+        radius = self.chart.radius
+
+        # superimposed grips are all returned, in order
+        grips = self.chart._grips_at(100, 100 - radius)
+        self.assertListEqual(
+            [item for x, y, angle, item in grips],
+            self.items[:2]
+        )
+
+        # last grip (at 360 degrees) is found near the 0 degree position
+        grips = self.chart._grips_at(100 + radius, 101)
+        self.assertListEqual(
+            [item for x, y, angle, item in grips],
+            self.items[3:]
+        )
+
+        # nothing near the origin or between grips
+        self.assertListEqual(self.chart._grips_at(100, 100), [])
+        self.assertListEqual(self.chart._grips_at(100, 100 + radius), [])
+
+    def test_move_boundary(self):
+        self.chart._layout()  # compute layout before adjustment
+        self.items[2].fraction = 0.125
+        self.items[3].fraction = 0.625
+        region = self.chart._move_boundary(2)
+        layout = self.chart._layout()
+        expected = self.chart._make_layout()
+        self.assertListEqual(layout.starts, expected.starts)
+        self.assertListEqual(layout.spans, expected.spans)
+        self.assertListEqual(layout.grips, expected.grips)
+        self.assertListEqual(layout.grip_angles, expected.grip_angles)
+        self.assertTrue(region.contains(QPoint(*layout.grips[2][:2])))
+
+    def test_adjustment_signals(self):
+        adjusted = []
+        batches = []
+        self.chart.itemAdjusted.connect(adjusted.append)
+        self.chart.itemsAdjusted.connect(batches.append)
+
+        # immediate
+        self.assertIsNone(self.chart.adjustmentInterval())
+        self.chart._item_adjusted(self.items[0])
+        self.assertListEqual(adjusted, self.items[:1])
+        self.chart._flush_adjusted()
+        self.assertListEqual(batches, [self.items[:1]])
+
+        # coalesced; each item is only reported once per batch
+        del adjusted[:], batches[:]
+        self.chart.setAdjustmentInterval(0)
+        self.assertEqual(self.chart.adjustmentInterval(), 0)
+        for i in 0, 1, 0, 1:
+            self.chart._item_adjusted(self.items[i])
+        self.assertListEqual(adjusted, [])
+        self.assertListEqual(batches, [])
+        self.chart._flush_adjusted()
+        self.assertListEqual(adjusted, self.items[:2])
+        self.assertListEqual(batches, [self.items[:2]])
+
+    def _drag(self, chart, points):
+        """Simulate a drag through the given points."""
+        def event(type, point):
+            return QMouseEvent(
+                type, QPoint(*point),
+                Qt.LeftButton, Qt.LeftButton, Qt.NoModifier
+            )
+        chart.mousePressEvent(event(QEvent.MouseButtonPress, points[0]))
+        for point in points[1:]:
+            chart.mouseMoveEvent(event(QEvent.MouseMove, point))
+        chart.mouseReleaseEvent(
+            event(QEvent.MouseButtonRelease, points[-1]))
+
+    def test_move_compression(self):
+        radius = self.chart.radius
+        # drag the grip at 90 degrees towards 135 degrees
+        points = [
+            (100, 100 - radius),
+            (90, 100 - radius),
+            (80, 100 - radius),
+            (70, 100 - radius),
+        ]
+        other = wwchartlib.piechart.AdjustablePieChart(items=[
+            wwchartlib.piechart.PieChartItem(fraction=item.fraction)
+            for item in self.items
+        ])
+        other.resize(200, 200)
+        self._drag(self.chart, points)
+
+        finished = []
+        other.finishedAdjusting.connect(lambda: finished.append(True))
+        other.setMaximumMoveRate(0)
+        self.assertEqual(other.maximumMoveRate(), 0)
+        self._drag(other, points)
+        for a, b in zip(other.chartItems(), self.items):
+            self.assertAlmostEqual(a.fraction, b.fraction)
+        self.assertListEqual(finished, [True])
+
+    def test_value_mode_drag(self):
+        self.chart.setChartItems([
+            wwchartlib.piechart.PieChartItem(value=v) for v in (1, 1, 2)
+        ])
+        self.chart.setValueMode(True)
+        radius = self.chart.radius
+        # slices cannot be dragged in value mode
+        self._drag(self.chart, [(100, 100 - radius), (80, 100 - radius)])
+        self.assertListEqual(
+            [item.fraction for item in self.chart.chartItems()],
+            [0.25, 0.25, 0.5]
+        )
+
+    def test_grips_at_matches_all_grips(self):
+        for x in xrange(0, 200, 3):
+            for y in xrange(0, 200, 3):
+                expected = [
+                    grip for grip in self.chart._grips()
+                    if ((grip[0] - x) ** 2 + (grip[1] - y) ** 2) ** 0.5
+                        < self.chart._grip_radius
+                ]
+                self.assertListEqual(self.chart._grips_at(x, y), expected)
+
+    def test_hover_without_grip(self):
+        self.chart.setHoverEnabled(True)
+        self.chart.mouseMoveEvent(QMouseEvent(
+            QEvent.MouseMove, QPoint(150, 90),
+            Qt.NoButton, Qt.NoButton, Qt.NoModifier
+        ))
+        self.assertEqual(self.chart._hovered, 0)
+
+    def test_stats(self):
+        self.chart.setStatsEnabled(True)
+        radius = self.chart.radius
+        self._drag(self.chart, [
+            (100, 100 - radius),
+            (90, 100 - radius),
+            (80, 100 - radius),
+        ])
+        stats = self.chart.stats()
+        self.assertEqual(stats['adjustments'], 2)
+        self.assertEqual(stats['drag_events']['count'], 1)
+        self.assertEqual(stats['drag_events']['total'], 2)
+        # itemAdjusted for two items and itemsAdjusted per adjustment,
+        # then finishedAdjusting
+        self.assertEqual(stats['signals'], 7)
+        self.assertEqual(stats['items_changed'], 2)
+        # adjustments only repaint the affected region
+        self.assertNotIn('set_colours', stats)
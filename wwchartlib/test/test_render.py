@@ -0,0 +1,136 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+
+from PySide.QtCore import *
+from PySide.QtGui import *
+
+import wwchartlib.piechart
+import wwchartlib.render
+
+from . import qt
+
+
+class TestRender(qt.QtTestCase):
+    def setUp(self):
+        self.items = [
+            wwchartlib.piechart.PieChartItem(fraction=0.5),
+            wwchartlib.piechart.PieChartItem(fraction=0.25),
+        ]
+
+    def test_render_to_image(self):
+        image = wwchartlib.render.render_to_image(self.items, (100, 80))
+        self.assertEqual(image.size(), QSize(100, 80))
+        # first slice is at the top, last quarter is empty
+        colour = list(wwchartlib.piechart.colours(2))[0]
+        self.assertEqual(QColor(image.pixel(50, 20)), colour)
+        self.assertEqual(image.pixel(70, 60), QColor(Qt.transparent).rgba())
+
+    def test_render_to_bytes(self):
+        data = wwchartlib.render.render_to_bytes(self.items, QSize(50, 50))
+        self.assertTrue(data.startswith('\x89PNG'))
+        data = wwchartlib.render.render_to_bytes(self.items, (50, 50), 'SVG')
+        self.assertIn('<svg', data)
+
+    def test_render_invalid(self):
+        self.items.append(wwchartlib.piechart.PieChartItem(fraction=0.5))
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ss]um of.*fractions cannot be greater than 1'
+        ):
+            wwchartlib.render.render_to_image(self.items, (50, 50))
+
+
+class TestRenderSpecs(qt.QtTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _spec(self, fractions, name, **kwargs):
+        spec = {
+            'fractions': fractions,
+            'size': [40, 40],
+            'output': os.path.join(self.dir, name),
+        }
+        spec.update(kwargs)
+        return spec
+
+    def test_spec_key(self):
+        spec = self._spec([0.5, 0.5], 'a.png', labels=['a', 'b'])
+        same = self._spec([0.5, 0.5], 'b.png')
+        svg = self._spec([0.5, 0.5], 'a.svg')
+        self.assertEqual(
+            wwchartlib.render.spec_key(spec),
+            wwchartlib.render.spec_key(same)
+        )
+        self.assertNotEqual(
+            wwchartlib.render.spec_key(spec),
+            wwchartlib.render.spec_key(svg)
+        )
+        self.assertEqual(wwchartlib.render.spec_format(svg), 'SVG')
+
+    def test_render_specs(self):
+        cache_dir = os.path.join(self.dir, 'cache')
+        specs = [
+            self._spec([0.5, 0.5], 'a.png'),
+            self._spec([0.5, 0.5], 'b.png'),
+            self._spec([0.25], 'c.png'),
+            self._spec([2], 'd.png'),
+        ]
+        result = wwchartlib.render.render_specs(specs, cache_dir, 1)
+        self.assertEqual(result['rendered'], 2)
+        self.assertEqual(result['cached'], 0)
+        self.assertEqual(result['written'], 3)
+        self.assertEqual(len(result['errors']), 1)
+        self.assertEqual(result['errors'][0][0], specs[3]['output'])
+        with open(specs[0]['output'], 'rb') as f:
+            self.assertTrue(f.read().startswith('\x89PNG'))
+
+        # second run finds charts in the cache
+        result = wwchartlib.render.render_specs(specs[:3], cache_dir, 1)
+        self.assertEqual(result['rendered'], 0)
+        self.assertEqual(result['cached'], 2)
+        self.assertEqual(result['written'], 3)
+
+    def test_render_specs_write_error(self):
+        specs = iter([
+            self._spec([0.5], os.path.join('missing', 'a.png')),
+            {'fractions': [0.5], 'output': 'no-size.png'},
+            {'size': [40, 40]},
+            self._spec([0.5], 'b.png'),
+        ])
+        result = wwchartlib.render.render_specs(specs, processes=1)
+        self.assertEqual(result['rendered'], 1)
+        self.assertEqual(result['written'], 1)
+        self.assertItemsEqual(
+            [output for output, error in result['errors']],
+            [os.path.join(self.dir, 'missing', 'a.png'), 'no-size.png',
+             'specification 3']
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.dir, 'b.png')))
+
+    def test_read_specs(self):
+        errors = []
+        specs = list(wwchartlib.render._read_specs(
+            ['{"size": [40, 40]}\n', '\n', '{"size": \n'], errors))
+        self.assertListEqual(specs, [{'size': [40, 40]}])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], 'line 3')
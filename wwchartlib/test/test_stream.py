@@ -0,0 +1,110 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import Queue
+
+from PySide.QtCore import *
+from PySide.QtGui import *
+
+import wwchartlib.piechart
+import wwchartlib.stream
+
+from . import qt
+
+
+class TestChartStream(qt.QtTestCase):
+    def setUp(self):
+        self.chart = wwchartlib.piechart.PieChart()
+        self.stream = wwchartlib.stream.ChartStream(self.chart)
+
+    def fractions(self):
+        return dict(
+            (item.label, item.fraction) for item in self.chart.chartItems())
+
+    def test_add(self):
+        self.chart.setStatsEnabled(True)
+        self.stream.feed([('a', 1), ('b', 2)])
+        self.stream.add('a')
+        self.stream.add('c', 4)
+        self.assertEqual(self.stream.total('a'), 2)
+        self.assertDictEqual(self.stream.totals(), {'a': 2, 'b': 2, 'c': 4})
+        # nothing is shown until the chart is updated
+        self.assertListEqual(self.chart.chartItems(), [])
+
+        self.stream.flush()
+        self.assertListEqual(
+            [item.label for item in self.chart.chartItems()],
+            ['a', 'b', 'c']
+        )
+        fractions = self.fractions()
+        self.assertAlmostEqual(fractions['a'], 0.25)
+        self.assertAlmostEqual(fractions['c'], 0.5)
+        self.assertTrue(self.chart.isValueMode())
+        self.assertEqual(self.chart.valueTotal(), 8)
+        # the changes are applied to the chart at once
+        self.assertEqual(self.chart.stats()['items_changed'], 1)
+
+        items = self.chart.chartItems()[:]
+        self.stream.setTotal('c', 0)
+        self.stream.flush()
+        self.assertListEqual(self.chart.chartItems(), items)
+        self.assertAlmostEqual(self.fractions()['a'], 0.5)
+        self.assertEqual(self.fractions()['c'], 0)
+
+        with self.assertRaisesRegexp(ValueError, 'cannot be negative'):
+            self.stream.add('a', -3)
+
+    def test_rounding(self):
+        for i in xrange(100):
+            self.stream.add(i, 0.1)
+        self.stream.flush()
+        self.assertLessEqual(
+            sum(item.fraction for item in self.chart.chartItems()), 1)
+
+    def test_queue(self):
+        queue = Queue.Queue(maxsize=10)
+        for category in 'abab':
+            queue.put((category, 1))
+        self.stream.setQueue(queue)
+        self.assertIs(self.stream.queue(), queue)
+        self.stream._poll()
+        self.assertTrue(queue.empty())
+        self.assertDictEqual(self.stream.totals(), {'a': 2, 'b': 2})
+        self.stream.setQueue(None)
+
+    def test_queue_timer(self):
+        queue = Queue.Queue()
+        queue.put(('a', 1))
+        self.stream.setMaximumRate(0)
+        self.stream.setQueue(queue)
+        # an idle stream does not poll on every event loop iteration
+        self.assertEqual(
+            self.stream._poll_timer.interval(),
+            self.stream._min_poll_interval
+        )
+        clock = QElapsedTimer()
+        clock.start()
+        while not self.stream.totals() and clock.elapsed() < 1000:
+            QApplication.processEvents()
+        self.assertDictEqual(self.stream.totals(), {'a': 1})
+        self.stream.setQueue(None)
+
+    def test_clear(self):
+        self.stream.add('a')
+        self.stream.flush()
+        self.stream.clear()
+        self.assertListEqual(self.chart.chartItems(), [])
+        self.assertDictEqual(self.stream.totals(), {})
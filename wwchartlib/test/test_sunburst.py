@@ -0,0 +1,140 @@
+# This file is part of wwchartlib
+# Copyright (C) 2011 Benon Technologies Pty Ltd
+#
+# wwchartlib is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from PySide.QtCore import *
+from PySide.QtGui import *
+
+import wwchartlib.piechart
+import wwchartlib.sunburst
+
+from . import qt
+
+Item = wwchartlib.sunburst.SunburstItem
+
+
+class TestSunburstItem(unittest.TestCase):
+    def test_init(self):
+        child = Item(fraction=1)
+        item = Item(0.5, children=[child], label='a')
+        self.assertIsInstance(item, wwchartlib.piechart.PieChartItem)
+        self.assertEqual(item.fraction, 0.5)
+        self.assertListEqual(item.children, [child])
+        self.assertIs(child.parent, item)
+        self.assertIsNone(item.parent)
+        self.assertListEqual(child.children, [])
+
+
+class TestSunburstChart(qt.QtTestCase):
+    def setUp(self):
+        # A is the top half, B the bottom half
+        self.a1 = Item(0.5)
+        self.a2 = Item(0.5)
+        self.b11 = Item(1)
+        self.b1 = Item(1, children=[self.b11])
+        self.a = Item(0.5, children=[self.a1, self.a2])
+        self.b = Item(0.5, children=[self.b1])
+        self.chart = wwchartlib.sunburst.SunburstChart(
+            items=[self.a, self.b])
+        self.chart.resize(200, 200)  # rings about 32 pixels wide
+
+    def test_item_at(self):
+        self.assertEqual(self.chart.ringCount(), 3)
+        self.assertIs(self.chart.itemAt(QPoint(111, 89)), self.a)
+        self.assertIs(self.chart.itemAt(QPoint(132, 68)), self.a1)
+        self.assertIs(self.chart.itemAt(QPoint(68, 68)), self.a2)
+        self.assertIs(self.chart.itemAt(QPoint(100, 175)), self.b11)
+        # a1 has no children
+        self.assertIsNone(self.chart.itemAt(QPoint(153, 47)))
+        # outside the chart
+        self.assertIsNone(self.chart.itemAt(QPoint(199, 100)))
+
+    def test_lazy_layout(self):
+        self.assertDictEqual(self.chart._child_layouts, {})
+        self.chart.itemAt(QPoint(100, 175))
+        self.assertItemsEqual(
+            self.chart._child_layouts, [id(self.b), id(self.b1)])
+
+        # changing a branch only discards the layouts of that branch
+        self.chart.itemAt(QPoint(68, 68))
+        b12 = Item(0.5)
+        self.chart.setChildItems(self.b1, [b12])
+        self.assertIs(b12.parent, self.b1)
+        self.assertIsNone(self.b11.parent)
+        self.assertItemsEqual(
+            self.chart._child_layouts, [id(self.a), id(self.b)])
+        self.assertIs(self.chart.itemAt(QPoint(47, 153)), b12)
+
+        with self.assertRaisesRegexp(
+            ValueError,
+            '[Ss]um of.*fractions cannot be greater than 1'
+        ):
+            self.chart.setChildItems(self.a, [Item(0.75), Item(0.75)])
+        # an item cannot be a child of its descendant
+        for item in self.b, self.b1, b12:
+            with self.assertRaisesRegexp(ValueError, 'descendant'):
+                self.chart.setChildItems(b12, [item])
+        self.assertListEqual(b12.children, [])
+        # nor of two items, nor both a child and a top-level item
+        with self.assertRaisesRegexp(ValueError, 'child of another'):
+            self.chart.setChildItems(b12, [self.a1])
+        with self.assertRaisesRegexp(ValueError, 'already in the chart'):
+            self.chart.setChildItems(b12, [self.a])
+        self.assertListEqual(b12.children, [])
+        self.assertIs(self.a1.parent, self.a)
+        # but the current children may be set again
+        self.chart.setChildItems(self.a, [self.a2, self.a1])
+        self.assertListEqual(self.a.children, [self.a2, self.a1])
+        self.assertIs(self.a1.parent, self.a)
+
+        # changing a top-level fraction repaints the rings outside it
+        region = self.chart._update_slices(0, 1)
+        self.assertTrue(region.contains(QPoint(150, 40)))
+        self.chart.setItemFraction(1, 0.25)
+        self.assertIs(self.chart.itemAt(QPoint(30, 126)), b12)
+        self.assertIsNone(self.chart.itemAt(QPoint(153, 153)))
+
+        # changing the top-level items discards all the layouts
+        self.chart.updateChartItems()
+        self.assertDictEqual(self.chart._child_layouts, {})
+
+    def test_set_fractions(self):
+        self.chart.setChartFractions([0.25, 0.75])
+        for item in self.chart.chartItems():
+            self.assertIsInstance(item, Item)
+        self.assertIsNone(self.chart.itemAt(QPoint(132, 68)))
+
+    def test_expand_threshold(self):
+        self.chart.setExpandThreshold(1000)
+        self.assertEqual(self.chart.expandThreshold(), 1000)
+        self.assertIs(self.chart.itemAt(QPoint(111, 89)), self.a)
+        self.assertIsNone(self.chart.itemAt(QPoint(132, 68)))
+        # with one ring, the centre fills the chart
+        self.chart.setExpandThreshold(1)
+        self.chart.setRingCount(1)
+        self.assertIs(self.chart.itemAt(QPoint(132, 68)), self.a)
+        self.assertIs(self.chart.itemAt(QPoint(100, 175)), self.b)
+        with self.assertRaisesRegexp(ValueError, 'less than 1'):
+            self.chart.setRingCount(0)
+        self.assertEqual(self.chart.ringCount(), 1)
+
+    def test_paint(self):
+        image = QImage(200, 200, QImage.Format_ARGB32_Premultiplied)
+        image.fill(0)
+        self.chart.render(image)
+        self.assertItemsEqual(
+            self.chart._child_layouts, [id(self.a), id(self.b), id(self.b1)])